@@ -19,7 +19,9 @@ from app.models import (
     UserTaskProgress,
     Guide,
     GuideView,
-    RefreshToken
+    RefreshToken,
+    CatalogVersion,
+    UserCompletionBitmap
 )
 
 config = context.config
@@ -0,0 +1,32 @@
+"""Add catalog version stamp
+
+Revision ID: 7c1e4d2a9b35
+Revises: 23ea0918263e
+Create Date: 2026-10-18 09:10:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4d2a9b35'
+down_revision: Union[str, None] = '23ea0918263e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('catalog_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO catalog_version (id, version) VALUES (1, 1)")
+
+
+def downgrade() -> None:
+    op.drop_table('catalog_version')
@@ -0,0 +1,47 @@
+"""Add per-user completion bitmaps
+
+Revision ID: b84f0e6d51a2
+Revises: 7c1e4d2a9b35
+Create Date: 2026-10-18 09:45:03.771920
+
+"""
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84f0e6d51a2'
+down_revision: Union[str, None] = '7c1e4d2a9b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bitmaps = op.create_table('user_completion_bitmaps',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('bitmap', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill from existing progress rows so the bitmap and the rows agree
+    rows = op.get_bind().execute(sa.text(
+        "SELECT user_id, task_id FROM user_task_progress WHERE completed = true"
+    ))
+    bits = defaultdict(int)
+    for user_id, task_id in rows:
+        bits[user_id] |= 1 << task_id
+
+    if bits:
+        op.bulk_insert(bitmaps, [
+            {"user_id": user_id, "bitmap": value.to_bytes((value.bit_length() + 7) // 8, "little")}
+            for user_id, value in bits.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('user_completion_bitmaps')
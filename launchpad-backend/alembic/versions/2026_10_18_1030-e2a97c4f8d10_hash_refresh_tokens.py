@@ -0,0 +1,40 @@
+"""Store refresh tokens by sha256 digest
+
+Revision ID: e2a97c4f8d10
+Revises: b84f0e6d51a2
+Create Date: 2026-10-18 10:30:41.052117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a97c4f8d10'
+down_revision: Union[str, None] = 'b84f0e6d51a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DELETE FROM refresh_tokens WHERE expires_at < now()")
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.String(length=64), nullable=True))
+    op.execute("UPDATE refresh_tokens SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')")
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=True)
+    op.create_index(op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'], unique=False)
+    op.drop_index('ix_refresh_tokens_token', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token')
+
+
+def downgrade() -> None:
+    # Raw tokens can't be recovered from their digests; existing sessions
+    # have to log in again
+    op.execute("DELETE FROM refresh_tokens")
+    op.add_column('refresh_tokens', sa.Column('token', sa.String(length=500), nullable=False))
+    op.create_index('ix_refresh_tokens_token', 'refresh_tokens', ['token'], unique=True)
+    op.drop_index(op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
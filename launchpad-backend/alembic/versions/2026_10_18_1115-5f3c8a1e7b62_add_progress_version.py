@@ -0,0 +1,26 @@
+"""Add progress_version to user_completion_bitmaps
+
+Revision ID: 5f3c8a1e7b62
+Revises: e2a97c4f8d10
+Create Date: 2026-10-18 11:15:08.311904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f3c8a1e7b62'
+down_revision: Union[str, None] = 'e2a97c4f8d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_completion_bitmaps', sa.Column('progress_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user_completion_bitmaps', 'progress_version')
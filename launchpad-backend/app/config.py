@@ -1,21 +1,94 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 import os
 
 
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # Defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Read replica for read-only endpoints; unset sends all reads to the primary
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_POOL_SIZE: int = 5
+    REPLICA_MAX_OVERFLOW: int = 10
+    # After a write, the user's reads go to the primary this long; keep it
+    # above the replica's worst replay lag. Shared through CACHE_BACKEND, so
+    # with several workers use mmap or redis there.
+    REPLICA_PIN_SECONDS: float = 5.0
     
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Expired refresh tokens are deleted in batches by a background task
+    REFRESH_TOKEN_PURGE_INTERVAL_SECONDS: int = 3600
+    REFRESH_TOKEN_PURGE_BATCH_SIZE: int = 1000
     
     # App
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
+    # Validate schema_response bodies against their schema (app.utils.responses);
+    # costs a full validation per response, so only for development and tests
+    VALIDATE_RESPONSES: bool = False
+    
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json | text
+    # Fraction of high-volume (per-request auth) records below WARNING to keep
+    LOG_SAMPLE_RATE: float = 0.01
+    # Log every SQL statement; independent of DEBUG
+    SQL_ECHO: bool = False
+    
+    # Shared cache (app.utils.shared_cache): memory | mmap | redis
+    CACHE_BACKEND: str = "memory"
+    CACHE_MEMORY_SIZE: int = 20000
+    # mmap: a file on tmpfs shared by the workers on one host
+    CACHE_MMAP_PATH: str = "/dev/shm/launchpad-cache"
+    CACHE_MMAP_SLOTS: int = 16384
+    CACHE_MMAP_SLOT_SIZE: int = 1024  # bytes; larger values aren't cached
+    # redis: any Redis-protocol server
+    CACHE_URL: str = "redis://localhost:6379/0"
+    CACHE_POOL_SIZE: int = 10
+    CACHE_TIMEOUT_SECONDS: float = 0.25  # redis round trip, or waiting for the mmap lock
+    # After a backend failure, skip the cache (load directly) this long
+    CACHE_BREAKER_SECONDS: float = 5.0
+    # Completion state is only cached with mmap or redis: a memory backend
+    # can't tell the other workers that a user's state changed
+    PROGRESS_CACHE_TTL_SECONDS: int = 300
+    
+    # Progress stream (app.utils.progress_events): local | postgres
+    PROGRESS_FANOUT: str = "local"
+    PROGRESS_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    PROGRESS_STREAM_QUEUE_SIZE: int = 100
+    
+    # Auth
+    USER_CACHE_TTL_SECONDS: int = 60
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    TOKEN_CACHE_SIZE: int = 10000
+    # Let read-only endpoints trust a verified token's user id without
+    # checking that the user row still exists
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+    
+    # Password hashing (Argon2 on a dedicated process pool)
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    
+    # Catalog cache
+    CATALOG_VERSION_CHECK_SECONDS: int = 30
+    
+    # Guides (rendered, compressed bodies cached per content hash)
+    GUIDE_CACHE_SIZE: int = 256
+    GUIDE_CACHE_TTL_SECONDS: int = 86400
+    # Guide views are buffered and written in batches
+    GUIDE_VIEW_FLUSH_SIZE: int = 500
+    GUIDE_VIEW_FLUSH_SECONDS: float = 5.0
+    GUIDE_VIEW_MAX_BUFFER: int = 10000
     
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173"
@@ -1,26 +1,151 @@
-from sqlalchemy import create_engine
+from contextlib import contextmanager
+from sqlalchemy import Select, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.config import get_settings
+from app.utils.metrics import TimedAsyncAdaptedQueuePool, TimedReplicaPool
+from app.utils.shared_cache import SharedCache
 
 settings = get_settings()
 
+# Synchronous engine, used by scripts and Alembic
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_size=5,
     max_overflow=10,
-    echo=settings.DEBUG
+    echo=settings.SQL_ECHO
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _as_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+def _async_database_url() -> str:
+    return settings.ASYNC_DATABASE_URL or _as_async_url(settings.DATABASE_URL)
+
+
+# Async engine, used by the API so queries don't block the event loop.
+# The pool class only adds checkout-wait timing for /metrics.
+async_engine = create_async_engine(
+    _async_database_url(),
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_pre_ping=True,
+    pool_size=5,
+    max_overflow=10,
+    echo=settings.SQL_ECHO
+)
+
+# Read-only engine on a streaming replica, if one is configured. Without it
+# read sessions simply use the primary.
+replica_engine = create_async_engine(
+    _as_async_url(settings.DATABASE_REPLICA_URL),
+    poolclass=TimedReplicaPool,
+    pool_pre_ping=True,
+    pool_size=settings.REPLICA_POOL_SIZE,
+    max_overflow=settings.REPLICA_MAX_OVERFLOW,
+    echo=settings.SQL_ECHO
+) if settings.DATABASE_REPLICA_URL else None
+
+# expire_on_commit=False: attributes read after commit must not trigger
+# implicit (and in async, illegal) lazy loads
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to the replica until the session writes.
+
+    The first flush or non-SELECT statement (or a SELECT ... FOR UPDATE)
+    pins the session to the primary for the rest of its life, so it reads
+    its own writes. Across requests, a user who just wrote is pinned by
+    `pin_recent_writer` (see `pin_user_to_primary`).
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if replica_engine is None or self.info.get("pinned"):
+            return async_engine.sync_engine
+        if self._flushing or not isinstance(clause, Select) or clause._for_update_arg is not None:
+            self.info["pinned"] = True
+            return async_engine.sync_engine
+        return replica_engine.sync_engine
+
+
+def pin_to_primary(db: AsyncSession) -> None:
+    """Send everything `db` runs from now on to the primary"""
+    db.sync_session.info["pinned"] = True
+
+
+def is_pinned(db: AsyncSession) -> bool:
+    """Whether `db` is (now) reading from the primary"""
+    return replica_engine is None or bool(db.sync_session.info.get("pinned"))
+
+
+# Users who wrote within REPLICA_PIN_SECONDS. Shared between workers, so a
+# write handled by one pins the user's reads on all of them.
+recent_writers = SharedCache("recent-writer", ttl=settings.REPLICA_PIN_SECONDS)
+
+
+async def pin_user_to_primary(user_id: int) -> None:
+    """Send the user's reads to the primary for REPLICA_PIN_SECONDS.
+
+    Call after committing a write the user's read endpoints show, so the
+    next requests don't read a replica that hasn't replayed it yet.
+    """
+    if replica_engine is not None:
+        await recent_writers.set(str(user_id), True)
+
+
+async def pin_recent_writer(db: AsyncSession, user_id: int) -> None:
+    """Pin `db` to the primary if `user_id` wrote recently"""
+    if not is_pinned(db) and await recent_writers.get(str(user_id)):
+        pin_to_primary(db)
+
+
+AsyncReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db():
+    """Session for read-mostly endpoints: replica reads, primary once it writes"""
+    async with AsyncReadSessionLocal() as db:
         yield db
+
+
+@contextmanager
+def count_queries(bind=async_engine.sync_engine):
+    """Count the SQL statements executed on `bind` inside the block"""
+    counter = {"count": 0}
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["count"] += 1
+
+    event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield counter
     finally:
-        db.close()
+        event.remove(bind, "before_cursor_execute", _before_cursor_execute)
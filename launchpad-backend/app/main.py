@@ -1,17 +1,63 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
-from app.routers import auth, modules, tasks, progress
+from app.database import AsyncSessionLocal, async_engine, replica_engine
+from app.routers import auth, modules, tasks, progress, guides, search, dashboard
+from app.utils.catalog import refresh_catalog
+from app.utils.guide_views import guide_view_recorder
+from app.utils.log import RequestIdMiddleware, configure_logging, shutdown_logging
+from app.utils.metrics import MetricsMiddleware, instrument_engine, render_metrics
+from app.utils.progress_events import progress_broker
+from app.utils.passwords import start_password_pool, shutdown_password_pool
+from app.utils.refresh_tokens import run_refresh_token_sweeper
+from app.utils.shared_cache import close_cache_backend
 
 settings = get_settings()
 
+configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Already configured at import; again after a previous lifespan's shutdown
+    configure_logging()
+    # Load the static module/task catalog once per worker
+    async with AsyncSessionLocal() as db:
+        await refresh_catalog(db)
+    start_password_pool()
+    sweeper = asyncio.create_task(run_refresh_token_sweeper())
+    guide_view_recorder.start()
+    await progress_broker.start()
+    yield
+    await progress_broker.stop()
+    await guide_view_recorder.stop()
+    sweeper.cancel()
+    with suppress(asyncio.CancelledError):
+        await sweeper
+    shutdown_password_pool()
+    await close_cache_backend()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    shutdown_logging()
+
+
 app = FastAPI(
     title="Launchpad API",
     description="Your adult life setup headquarters",
     version="1.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
+# Attribute SQL statements to the request that ran them
+instrument_engine(async_engine.sync_engine)
+if replica_engine is not None:
+    instrument_engine(replica_engine.sync_engine)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -21,11 +67,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Latency/SQL metrics; added after CORS so it is outer and times CORS too
+app.add_middleware(MetricsMiddleware)
+
+# Outermost, so every log record of a request carries its id
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(modules.router, prefix="/api/v1")
 app.include_router(tasks.router, prefix="/api/v1")
 app.include_router(progress.router, prefix="/api/v1")
+app.include_router(guides.router, prefix="/api/v1")
+app.include_router(search.router, prefix="/api/v1")
+app.include_router(dashboard.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -41,3 +96,11 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    pools = [async_engine.sync_engine.pool]
+    if replica_engine is not None:
+        pools.append(replica_engine.sync_engine.pool)
+    return render_metrics(*pools)
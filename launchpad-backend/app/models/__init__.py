@@ -5,6 +5,8 @@ from app.models.user_task_progress import UserTaskProgress
 from app.models.guide import Guide
 from app.models.guide_view import GuideView
 from app.models.refresh_token import RefreshToken
+from app.models.catalog_version import CatalogVersion
+from app.models.user_completion_bitmap import UserCompletionBitmap
 
 __all__ = [
     "User",
@@ -14,4 +16,6 @@ __all__ = [
     "Guide",
     "GuideView",
     "RefreshToken",
+    "CatalogVersion",
+    "UserCompletionBitmap",
 ]
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)  # single row, id = 1
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
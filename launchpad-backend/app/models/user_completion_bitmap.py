@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, LargeBinary, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class UserCompletionBitmap(Base):
+    __tablename__ = "user_completion_bitmaps"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    # Bit n (byte n // 8, least significant bit first) is set when the user
+    # has completed the task with id n. Mirrors user_task_progress.completed.
+    bitmap = Column(LargeBinary, nullable=False, default=b"")
+    # Bumped on every completion write; part of the progress endpoints' ETags
+    progress_version = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,20 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from datetime import datetime, timedelta
 
-from app.database import get_db
+from app.database import get_db, pin_user_to_primary
 from app.models.user import User
-from app.models.refresh_token import RefreshToken
+from app.schemas.user import RefreshTokenRequest, RefreshTokenResponse
 from app.utils.auth import (
-    verify_password,
-    get_password_hash,
     create_access_token,
     create_refresh_token,
     get_current_user,
+    verify_token,
     REFRESH_TOKEN_EXPIRE_DAYS
 )
+from app.utils.passwords import hash_password, verify_password
+from app.utils.refresh_tokens import consume_refresh_token, store_refresh_token
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -35,17 +36,17 @@ class TokenResponse(BaseModel):
     user: dict
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def register(request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(request: RegisterRequest, db: AsyncSession = Depends(get_db)):
     # Check if user exists
-    existing_user = db.query(User).filter(User.email == request.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == request.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create user
-    hashed_password = get_password_hash(request.password)
+    # Create user (Argon2 runs on the password hashing pool)
+    hashed_password = await hash_password(request.password)
     user = User(
         email=request.email,
         password_hash=hashed_password,
@@ -53,22 +54,17 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
         age=request.age
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await pin_user_to_primary(user.id)
     
     # Create tokens
     access_token = create_access_token(user.id)
     refresh_token = create_refresh_token(user.id)
     
-    # Store refresh token with expiration
-    expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token_obj = RefreshToken(
-        user_id=user.id,
-        token=refresh_token,
-        expires_at=expires_at
-    )
-    db.add(refresh_token_obj)
-    db.commit()
+    # Store refresh token (by digest) with expiration
+    store_refresh_token(db, user.id, refresh_token, REFRESH_TOKEN_EXPIRE_DAYS)
+    await db.commit()
     
     return {
         "access_token": access_token,
@@ -84,28 +80,34 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
     }
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     # Find user
-    user = db.query(User).filter(User.email == request.email).first()
-    if not user or not verify_password(request.password, user.password_hash):
+    user = await db.scalar(select(User).where(User.email == request.email))
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password"
+        )
+    
+    valid, new_hash = await verify_password(request.password, user.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
+    # Argon2 parameters changed since this hash was made: store an upgraded
+    # hash (committed together with the refresh token below)
+    if new_hash:
+        user.password_hash = new_hash
+    
     # Create tokens
     access_token = create_access_token(user.id)
     refresh_token = create_refresh_token(user.id)
     
-    # Store refresh token with expiration
-    expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    refresh_token_obj = RefreshToken(
-        user_id=user.id,
-        token=refresh_token,
-        expires_at=expires_at
-    )
-    db.add(refresh_token_obj)
-    db.commit()
+    # Store refresh token (by digest) with expiration
+    store_refresh_token(db, user.id, refresh_token, REFRESH_TOKEN_EXPIRE_DAYS)
+    await db.commit()
     
     return {
         "access_token": access_token,
@@ -120,6 +122,30 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
         }
     }
 
+@router.post("/refresh", response_model=RefreshTokenResponse)
+async def refresh(request: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    verify_token(request.refresh_token, token_type="refresh")
+    
+    # Rotate: the presented token is deleted as it is redeemed, so a replayed
+    # or already-rotated token finds no row
+    user_id = await consume_refresh_token(db, request.refresh_token)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token"
+        )
+    
+    access_token = create_access_token(user_id)
+    refresh_token = create_refresh_token(user_id)
+    store_refresh_token(db, user_id, refresh_token, REFRESH_TOKEN_EXPIRE_DAYS)
+    await db.commit()
+    
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
 @router.get("/me")
 async def get_me(current_user: User = Depends(get_current_user)):
     return {
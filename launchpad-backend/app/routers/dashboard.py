@@ -0,0 +1,67 @@
+import hashlib
+
+from fastapi import APIRouter, Depends, Request, Response
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_read_db
+from app.models.user import User
+from app.schemas.dashboard import DashboardResponse
+from app.utils.auth import get_current_user
+from app.utils.catalog import get_catalog
+from app.utils.etag import not_modified, progress_etag, set_etag
+from app.utils.progress import get_cached_completion_state
+from app.utils.progress_views import (
+    module_cards, module_counts, overall_progress, recommended_tasks
+)
+from app.utils.responses import schema_response
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Everything the dashboard shows, in one request.
+
+    Replaces the page's /auth/me + /modules + /progress fan-out: one token
+    check, one session, one completion bitmap query, and the per-module
+    counts computed once for both the cards and the totals.
+    """
+    catalog = await get_catalog(db)
+    completion_bits, progress_version = await get_cached_completion_state(current_user.id)
+    
+    dashboard_user = {
+        "id": current_user.id,
+        "uuid": str(current_user.uuid),
+        "email": current_user.email,
+        "name": current_user.name,
+        "age": current_user.age,
+        "onboarding_completed": current_user.onboarding_completed,
+        "biggest_challenge": current_user.biggest_challenge,
+        "life_stage": current_user.life_stage
+    }
+    
+    # The user's own fields are in the body too, and the profile fields pick
+    # the recommendations: a digest of exactly those fields, so any edit
+    # changes the ETag however close together edits land
+    variant = hashlib.blake2b(to_json(dashboard_user), digest_size=8).hexdigest()
+    etag = progress_etag(catalog.version, current_user.id, progress_version, variant=variant)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_etag(response, etag)
+    
+    counts = module_counts(catalog, completion_bits)
+    
+    # Built to match DashboardResponse; encoded once, not re-validated
+    return schema_response({
+        "user": dashboard_user,
+        "modules": module_cards(counts),
+        **overall_progress(catalog, counts),
+        "next_recommended_tasks": recommended_tasks(catalog, completion_bits, current_user)
+    }, DashboardResponse, response)
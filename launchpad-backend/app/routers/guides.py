@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.database import get_read_db
+from app.utils.auth import get_current_user_id
+from app.utils.catalog import get_catalog
+from app.utils.etag import not_modified, set_etag
+from app.utils.guide_views import guide_view_recorder
+from app.utils.guides import choose_encoding, get_rendered_guide, guide_key, representation_etag
+
+router = APIRouter(prefix="/guides", tags=["Guides"])
+
+@router.get("")
+async def list_guides(
+    request: Request,
+    response: Response,
+    module: Optional[str] = None,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
+):
+    # Guide metadata lives in the in-memory catalog; no queries
+    catalog = await get_catalog(db)
+
+    # The listing only changes with the catalog
+    etag = f'W/"c{catalog.version}"' if module is None else f'W/"c{catalog.version}-{module}"'
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_etag(response, etag)
+
+    return [
+        {
+            "id": guide.id,
+            "slug": guide.slug,
+            "module": guide.module_slug,
+            "title": guide.title,
+            "subtitle": guide.subtitle,
+            "reading_time": guide.reading_time,
+            "is_essential": guide.is_essential
+        }
+        for guide in catalog.guides
+        if module is None or guide.module_slug == module
+    ]
+
+@router.get("/{slug}")
+async def get_guide(
+    slug: str,
+    request: Request,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
+):
+    catalog = await get_catalog(db)
+    guide = catalog.guides_by_slug.get(slug)
+    if not guide:
+        raise HTTPException(status_code=404, detail="Guide not found")
+
+    # Buffered; written in batches by the recorder's background task
+    guide_view_recorder.record(current_user_id, guide.id)
+
+    # Served as pre-built bytes: the body is rendered and compressed once per
+    # content hash, then reused until the guide or its tasks change
+    encoding = choose_encoding(request.headers.get("accept-encoding"))
+    key = guide_key(guide, catalog)
+    etag = representation_etag(key, encoding)
+
+    cached = not_modified(request, etag)
+    if cached:
+        cached.headers["Vary"] = "Authorization, Accept-Encoding"
+        return cached
+
+    rendered = await get_rendered_guide(db, guide, catalog, key)
+    response = Response(content=getattr(rendered, encoding), media_type="application/json")
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    set_etag(response, etag)
+    response.headers["Vary"] = "Authorization, Accept-Encoding"
+    return response
@@ -1,72 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.database import get_db
-from app.models.user import User
-from app.models.module import Module
-from app.models.task import Task
+from app.database import get_read_db
 from app.models.user_task_progress import UserTaskProgress
-from app.utils.auth import get_current_user
+from app.schemas.module import ModuleCard, ModuleDetail
+from app.utils.auth import get_current_user_id
+from app.utils.catalog import get_catalog
+from app.utils.etag import not_modified, progress_etag, set_etag
+from app.utils.progress import get_cached_completion_state
+from app.utils.progress_views import module_cards, module_counts
+from app.utils.responses import schema_response
 
 router = APIRouter(prefix="/modules", tags=["Modules"])
 
-@router.get("")
+@router.get("", response_model=List[ModuleCard])
 async def get_all_modules(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    modules = db.query(Module).all()
+    # Modules and tasks come from the in-memory catalog; the only query is
+    # this user's completion bitmap
+    catalog = await get_catalog(db)
+    completion_bits, progress_version = await get_cached_completion_state(current_user_id)
     
-    result = []
-    for module in modules:
-        # Get all tasks for this module
-        tasks = db.query(Task).filter(Task.module_id == module.id).all()
-        
-        # Get completed tasks for this user
-        completed_tasks = db.query(UserTaskProgress).filter(
-            UserTaskProgress.user_id == current_user.id,
-            UserTaskProgress.task_id.in_([t.id for t in tasks]),
-            UserTaskProgress.completed == True
-        ).count()
-        
-        total_tasks = len(tasks)
-        progress_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-        
-        result.append({
-            "id": module.id,
-            "name": module.name,
-            "slug": module.slug,
-            "description": module.description,
-            "icon": module.icon,
-            "color": module.color,
-            "order": module.order_index,  # FIXED: use order_index
-            "completed_tasks": completed_tasks,
-            "total_tasks": total_tasks,
-            "progress_percentage": round(progress_percentage, 1)
-        })
+    etag = progress_etag(catalog.version, current_user_id, progress_version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_etag(response, etag)
     
-    return sorted(result, key=lambda x: x["order"])
+    # Built to match ModuleCard; encoded once, not re-validated
+    return schema_response(module_cards(module_counts(catalog, completion_bits)), List[ModuleCard], response)
 
-@router.get("/{slug}")
+@router.get("/{slug}", response_model=ModuleDetail)
 async def get_module_detail(
     slug: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
 ):
     # Get module
-    module = db.query(Module).filter(Module.slug == slug).first()
+    catalog = await get_catalog(db)
+    module = catalog.modules_by_slug.get(slug)
     if not module:
         raise HTTPException(status_code=404, detail="Module not found")
     
-    # Get all tasks for this module
-    tasks = db.query(Task).filter(Task.module_id == module.id).order_by(Task.order_index).all()  # FIXED: use order_index
+    # completed_at only changes with a completion write, so the progress
+    # version covers this view too
+    _, progress_version = await get_cached_completion_state(current_user_id)
+    etag = progress_etag(catalog.version, current_user_id, progress_version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_etag(response, etag)
+    
+    # Tasks are already sorted by order_index in the catalog
+    tasks = module.tasks
     
     # Get user's progress for these tasks
-    user_progress = db.query(UserTaskProgress).filter(
-        UserTaskProgress.user_id == current_user.id,
-        UserTaskProgress.task_id.in_([t.id for t in tasks])
-    ).all()
+    user_progress = (await db.scalars(
+        select(UserTaskProgress).where(
+            UserTaskProgress.user_id == current_user_id,
+            UserTaskProgress.task_id.in_([t.id for t in tasks])
+        )
+    )).all()
     
     # Create a map of task_id -> progress
     progress_map = {p.task_id: p for p in user_progress}
@@ -89,7 +91,7 @@ async def get_module_detail(
     total_count = len(task_list)
     progress_percentage = (completed_count / total_count * 100) if total_count > 0 else 0
     
-    return {
+    return schema_response({
         "id": module.id,
         "name": module.name,
         "slug": module.slug,
@@ -100,4 +102,4 @@ async def get_module_detail(
         "completed_tasks": completed_count,
         "total_tasks": total_count,
         "progress_percentage": round(progress_percentage, 1)
-    }
+    }, ModuleDetail, response)
@@ -1,89 +1,106 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.database import get_db
+import asyncio
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.database import get_read_db
 from app.models.user import User
-from app.models.module import Module
-from app.models.task import Task
-from app.models.user_task_progress import UserTaskProgress
 from app.schemas.progress import ProgressOverview, ModuleProgress, RecommendedTask
-from app.utils.auth import get_current_user
+from app.utils.auth import get_current_user, security, verify_token
+from app.utils.catalog import get_catalog
+from app.utils.etag import not_modified, progress_etag, set_etag
+from app.utils.progress import get_cached_completion_state
+from app.utils.progress_events import RESYNC, progress_broker
+from app.utils.progress_views import (
+    module_counts, module_progress, overall_progress, recommendation_variant, recommended_tasks
+)
+from app.utils.responses import schema_response
+from app.utils.user_cache import user_exists
 
-router = APIRouter(prefix="/progress", tags=["Progress"])
+settings = get_settings()
 
+router = APIRouter(prefix="/progress", tags=["Progress"])
 
 @router.get("", response_model=ProgressOverview)
-def get_user_progress(
+async def get_user_progress(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get overall progress and recommendations"""
     
-    # Get total tasks across all modules
-    total_tasks = db.query(Task).count()
-    
-    # Get completed tasks for user
-    completed_tasks = db.query(UserTaskProgress).filter(
-        UserTaskProgress.user_id == current_user.id,
-        UserTaskProgress.completed == True
-    ).count()
-    
-    # Calculate overall progress
-    overall_progress = int((completed_tasks / total_tasks * 100)) if total_tasks > 0 else 0
-    
-    # Get progress per module
-    modules = db.query(Module).order_by(Module.order_index).all()
-    module_progress_list = []
-    
-    for module in modules:
-        module_total = db.query(Task).filter(Task.module_id == module.id).count()
-        
-        module_completed = db.query(UserTaskProgress).join(Task).filter(
-            Task.module_id == module.id,
-            UserTaskProgress.user_id == current_user.id,
-            UserTaskProgress.completed == True
-        ).count()
-        
-        module_percentage = int((module_completed / module_total * 100)) if module_total > 0 else 0
-        
-        module_progress_list.append({
-            "slug": module.slug,
-            "name": module.name,
-            "total_tasks": module_total,
-            "completed_tasks": module_completed,
-            "progress_percentage": module_percentage
-        })
+    # Totals and ordering come from the in-memory catalog; the only query is
+    # this user's completion bitmap. The user (for their onboarding profile)
+    # comes from the user cache.
+    catalog = await get_catalog(db)
+    completion_bits, progress_version = await get_cached_completion_state(current_user.id)
     
-    # Get recommended next tasks (incomplete tasks, ordered by difficulty and time)
-    # Get all incomplete task IDs for this user
-    completed_task_ids = db.query(UserTaskProgress.task_id).filter(
-        UserTaskProgress.user_id == current_user.id,
-        UserTaskProgress.completed == True
-    ).all()
-    completed_task_ids = [id[0] for id in completed_task_ids]
+    # Recommendations depend on the profile too
+    etag = progress_etag(catalog.version, current_user.id, progress_version, variant=recommendation_variant(current_user))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_etag(response, etag)
     
-    # Get incomplete tasks
-    recommended_tasks_query = db.query(Task, Module.slug).join(Module).filter(
-        Task.id.notin_(completed_task_ids) if completed_task_ids else True
-    ).order_by(
-        Task.difficulty.desc(),  # Easy tasks first (easy > medium > hard alphabetically reversed)
-        Task.estimated_time.asc()  # Shorter tasks first
-    ).limit(3)
+    counts = module_counts(catalog, completion_bits)
     
-    recommended_tasks = []
-    for task, module_slug in recommended_tasks_query:
-        recommended_tasks.append({
-            "id": task.id,
-            "title": task.title,
-            "module": module_slug,
-            "difficulty": task.difficulty,
-            "estimated_time": task.estimated_time
-        })
-    
-    return {
-        "total_tasks": total_tasks,
-        "completed_tasks": completed_tasks,
-        "progress_percentage": overall_progress,
-        "modules": module_progress_list,
-        "next_recommended_tasks": recommended_tasks
-    }
+    # Built to match ProgressOverview; encoded once, not re-validated
+    return schema_response({
+        **overall_progress(catalog, counts),
+        "modules": module_progress(counts),
+        "next_recommended_tasks": recommended_tasks(catalog, completion_bits, current_user)
+    }, ProgressOverview, response)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_progress(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Server-sent events with this user's completion changes, from any device.
+
+    - `progress`: `{"changes": [{"task_id", "module", "completed", "completed_at"}]}`
+    - `resync`: changes may have been missed (always sent first); refetch
+
+    Clients read it with fetch() rather than EventSource so the token stays
+    in the Authorization header, out of URLs and access logs. The stream
+    ends when the token expires or the user is deleted; the client then
+    reconnects with a refreshed token.
+    """
+    # No session from a dependency: the connection stays open for as long as
+    # the client does, and must not hold a pooled session meanwhile
+    payload = verify_token(credentials.credentials)
+    user_id = int(payload["sub"])
+    expires_at = payload["exp"]
+    if not await user_exists(user_id):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    async def events():
+        with progress_broker.subscribe(user_id) as queue:
+            yield "event: resync\ndata: {}\n\n"
+            while True:
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    return
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), min(settings.PROGRESS_STREAM_HEARTBEAT_SECONDS, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    # Cached, so at most one lookup per USER_CACHE_TTL_SECONDS
+                    if not await user_exists(user_id):
+                        return
+                    # Keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                if message is RESYNC:
+                    yield "event: resync\ndata: {}\n\n"
+                else:
+                    yield f"event: progress\ndata: {message}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
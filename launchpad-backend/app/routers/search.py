@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.database import get_read_db
+from app.utils.auth import get_current_user_id
+from app.utils.catalog import get_catalog
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("")
+async def search(
+    q: str = Query(..., min_length=1, max_length=100),
+    type: Optional[str] = Query(None, pattern="^(task|guide)$"),
+    limit: int = Query(20, ge=1, le=50),
+    current_user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db)
+):
+    # Served from the catalog's in-memory index, rebuilt with the catalog
+    catalog = await get_catalog(db)
+    hits = catalog.search_index.search(q, limit=limit, kinds=(type,) if type else None)
+    
+    results = []
+    for hit in hits:
+        if hit.kind == "task":
+            task = catalog.tasks_by_id[hit.id]
+            results.append({
+                "type": "task",
+                "id": task.id,
+                "title": task.title,
+                "description": task.description,
+                "module": task.module_slug,
+                "guide_slug": task.guide_slug,
+                "score": round(hit.score, 3)
+            })
+        else:
+            guide = catalog.guides_by_id[hit.id]
+            results.append({
+                "type": "guide",
+                "id": guide.id,
+                "title": guide.title,
+                "subtitle": guide.subtitle,
+                "module": guide.module_slug,
+                "slug": guide.slug,
+                "score": round(hit.score, 3)
+            })
+    
+    return {"query": q, "results": results}
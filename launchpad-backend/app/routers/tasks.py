@@ -1,51 +1,95 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
-from app.database import get_db
+from app.database import get_db, pin_user_to_primary
 from app.models.user import User
-from app.models.task import Task
-from app.models.user_task_progress import UserTaskProgress
 from app.utils.auth import get_current_user
+from app.utils.catalog import get_catalog
+from app.utils.progress import invalidate_completion_state, upsert_task_completion, upsert_task_completions
+from app.utils.progress_events import progress_broker
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 class TaskCompletionRequest(BaseModel):
     completed: bool
 
+class TaskCompletionItem(BaseModel):
+    task_id: int
+    completed: bool
+
+class BulkTaskCompletionRequest(BaseModel):
+    items: List[TaskCompletionItem] = Field(..., min_length=1, max_length=500)
+
+class TaskCompletionResult(BaseModel):
+    task_id: int
+    status: str  # 'updated' or 'not_found'
+    completed: Optional[bool] = None
+    completed_at: Optional[str] = None
+
+class BulkTaskCompletionResponse(BaseModel):
+    results: List[TaskCompletionResult]
+
+@router.patch("/completion", response_model=BulkTaskCompletionResponse)
+async def update_task_completions(
+    request: BulkTaskCompletionRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Apply many completion toggles in one transaction"""
+    # Last write wins when the same task appears twice
+    changes = {item.task_id: item.completed for item in request.items}
+    
+    # Unknown ids (any int, however large) are reported as not_found here
+    # rather than reaching the statement
+    catalog = await get_catalog(db)
+    known = [(task_id, completed) for task_id, completed in changes.items() if task_id in catalog.tasks_by_id]
+    
+    stored = []
+    if known:
+        stored = await upsert_task_completions(db, current_user.id, known)
+        await db.commit()
+        await invalidate_completion_state(current_user.id)
+        await pin_user_to_primary(current_user.id)
+        await progress_broker.publish(current_user.id, catalog, stored)
+    
+    stored_by_id = {row.task_id: row for row in stored}
+    results = []
+    for task_id in changes:
+        row = stored_by_id.get(task_id)
+        if row is None:
+            results.append({"task_id": task_id, "status": "not_found"})
+            continue
+        results.append({
+            "task_id": task_id,
+            "status": "updated",
+            "completed": row.completed,
+            "completed_at": row.completed_at.isoformat() if row.completed_at else None
+        })
+    
+    return {"results": results}
+
 @router.patch("/{task_id}/completion")
 async def update_task_completion(
     task_id: int,
     request: TaskCompletionRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    # Verify task exists
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
+    # Checked before building the statement: the bitmap update shifts by
+    # task_id, so a negative or huge id must never get that far
+    catalog = await get_catalog(db)
+    if task_id not in catalog.tasks_by_id:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    # Get or create user progress
-    progress = db.query(UserTaskProgress).filter(
-        UserTaskProgress.user_id == current_user.id,
-        UserTaskProgress.task_id == task_id
-    ).first()
-    
-    if not progress:
-        progress = UserTaskProgress(
-            user_id=current_user.id,
-            task_id=task_id,
-            completed=request.completed,
-            completed_at=datetime.utcnow() if request.completed else None
-        )
-        db.add(progress)
-    else:
-        progress.completed = request.completed
-        progress.completed_at = datetime.utcnow() if request.completed else None
-    
-    db.commit()
-    db.refresh(progress)
+    # One statement: upsert the progress row and flip the bitmap bit
+    progress = await upsert_task_completion(db, current_user.id, task_id, request.completed)
+    await db.commit()
+    await invalidate_completion_state(current_user.id)
+    await pin_user_to_primary(current_user.id)
+    # Other devices of this user learn about it through /progress/stream
+    await progress_broker.publish(current_user.id, catalog, [progress])
     
     return {
         "task_id": task_id,
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+from app.schemas.module import ModuleCard
+from app.schemas.progress import RecommendedTask
+
+
+class DashboardUser(BaseModel):
+    id: int
+    uuid: str
+    email: str
+    name: Optional[str] = None
+    age: Optional[int] = None
+    onboarding_completed: Optional[bool] = None
+    biggest_challenge: Optional[str] = None
+    life_stage: Optional[str] = None
+
+
+class DashboardResponse(BaseModel):
+    user: DashboardUser
+    modules: List[ModuleCard]
+    total_tasks: int
+    completed_tasks: int
+    progress_percentage: int
+    next_recommended_tasks: List[RecommendedTask]
@@ -56,3 +56,39 @@ class ModuleDetailResponse(ModuleResponse):
 
     class Config:
         from_attributes = True
+
+
+# Views built by the modules router from the in-memory catalog
+class ModuleCard(BaseModel):
+    id: int
+    name: str
+    slug: str
+    description: Optional[str] = None
+    icon: Optional[str] = None
+    color: Optional[str] = None
+    order: int
+    completed_tasks: int
+    total_tasks: int
+    progress_percentage: float
+
+
+class ModuleTaskStatus(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    order: int
+    completed: bool
+    completed_at: Optional[str] = None
+
+
+class ModuleDetail(BaseModel):
+    id: int
+    name: str
+    slug: str
+    description: Optional[str] = None
+    icon: Optional[str] = None
+    color: Optional[str] = None
+    tasks: List[ModuleTaskStatus]
+    completed_tasks: int
+    total_tasks: int
+    progress_percentage: float
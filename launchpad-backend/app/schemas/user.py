@@ -64,3 +64,7 @@ class RefreshTokenRequest(BaseModel):
 class AccessTokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+
+
+class RefreshTokenResponse(AccessTokenResponse):
+    refresh_token: str
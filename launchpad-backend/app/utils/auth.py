@@ -1,14 +1,21 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import logging
 import os
+import time
+import uuid
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import get_read_db, pin_recent_writer
 from app.models.user import User
+from app.utils.cache import TTLCache
+from app.utils.metrics import token_cache_hits_total, token_cache_misses_total
+from app.utils.passwords import password_context
+from app.utils.user_cache import get_user
 
 # Settings from environment
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -16,14 +23,24 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+settings = get_settings()
+
+# Per-request records here are sampled, see app.utils.log
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
 
+# Tokens that already passed signature and claim validation, so a client
+# reusing the same access token skips the HMAC decode on later requests.
+# Entries never outlive the token's own `exp`.
+verified_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+
+# Blocking helpers for scripts; request handlers use app.utils.passwords
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_context().hash(password)
 
 def create_access_token(user_id: int) -> str:
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -32,21 +49,36 @@ def create_access_token(user_id: int) -> str:
 
 def create_refresh_token(user_id: int) -> str:
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode = {"sub": str(user_id), "exp": expire, "type": "refresh"}  # Convert to string
+    # jti keeps two tokens issued in the same second distinct
+    to_encode = {"sub": str(user_id), "exp": expire, "type": "refresh", "jti": uuid.uuid4().hex}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-def verify_token(token: str) -> dict:
+def verify_token(token: str, token_type: str = "access") -> dict:
+    # Only access tokens are cached; a refresh token is redeemed once and
+    # always goes through the full decode
+    if token_type == "access":
+        payload = verified_token_cache.get(token)
+        if payload is not None:
+            token_cache_hits_total.inc(())
+            return payload
+        token_cache_misses_total.inc(())
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id_str: str = payload.get("sub")
-        if user_id_str is None:
+        if user_id_str is None or payload.get("type") != token_type:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token"
             )
+        
+        if token_type == "access":
+            # jose has already rejected expired tokens, so this is positive
+            remaining = payload["exp"] - time.time() if "exp" in payload else settings.TOKEN_CACHE_TTL_SECONDS
+            verified_token_cache.set(token, payload, ttl=min(remaining, settings.TOKEN_CACHE_TTL_SECONDS))
         return payload
     except JWTError as e:
-        print(f"❌ JWT Error: {e}")
+        logger.info("Rejected token: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
@@ -54,23 +86,40 @@ def verify_token(token: str) -> dict:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> User:
-    token = credentials.credentials
-    print(f"🔍 Verifying token: {token[:20]}...")
-    
-    payload = verify_token(token)
+    payload = verify_token(credentials.credentials)
     user_id_str = payload.get("sub")
     user_id = int(user_id_str)  # Convert string back to int
-    print(f"🔍 Token decoded, user_id: {user_id}")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Read-your-writes: everything this request reads, including the
+    # handler's queries on the same session
+    await pin_recent_writer(db, user_id)
+    user = await get_user(db, user_id)
     if not user:
-        print(f"❌ User not found for id: {user_id}")
+        logger.warning("Valid token for missing user %d", user_id)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
     
-    print(f"✅ User authenticated: {user.email}")
+    logger.debug("Authenticated user %d", user_id)
     return user
+
+async def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_read_db)
+) -> int:
+    """User id for read-only endpoints.
+
+    With AUTH_TRUST_TOKEN_CLAIMS the verified token's `sub` claim is used as
+    is, skipping the user lookup entirely.
+    """
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        payload = verify_token(credentials.credentials)
+        user_id = int(payload.get("sub"))
+        await pin_recent_writer(db, user_id)
+        return user_id
+    
+    user = await get_current_user(credentials=credentials, db=db)
+    return user.id
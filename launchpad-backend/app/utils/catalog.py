@@ -0,0 +1,250 @@
+"""In-process cache of the static module/task catalog.
+
+Modules and tasks only change when the catalog is re-seeded, so each worker
+keeps one immutable snapshot in memory and reloads it when the version stamp
+in the `catalog_version` table moves.
+"""
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import AsyncReadSessionLocal
+from app.models.catalog_version import CatalogVersion
+from app.models.guide import Guide
+from app.models.module import Module
+from app.models.task import Task
+from app.utils.recommendations import Profile, build_recommendation_orders
+from app.utils.search import SearchDocument, SearchIndex
+from app.utils.shared_cache import SharedCache
+
+settings = get_settings()
+
+# The version stamp, shared so workers read it from the database once per
+# interval between them rather than once each
+catalog_version_cache = SharedCache("catalog", ttl=settings.CATALOG_VERSION_CHECK_SECONDS)
+
+
+@dataclass(frozen=True)
+class CatalogTask:
+    id: int
+    module_id: int
+    module_slug: str
+    title: str
+    description: Optional[str]
+    estimated_time: Optional[int]
+    difficulty: Optional[str]
+    order_index: int
+    guide_slug: Optional[str]
+
+
+@dataclass(frozen=True)
+class CatalogModule:
+    id: int
+    slug: str
+    name: str
+    description: Optional[str]
+    icon: Optional[str]
+    color: Optional[str]
+    order_index: int
+    tasks: Tuple[CatalogTask, ...]  # sorted by order_index
+    task_mask: int  # bit n set for each task id n, see app.utils.progress
+
+
+@dataclass(frozen=True)
+class CatalogGuide:
+    id: int
+    slug: str
+    module_slug: str
+    title: str
+    subtitle: Optional[str]
+    reading_time: Optional[int]
+    is_essential: bool
+    content_hash: str  # sha256 of the markdown; the content itself stays in the database
+    task_ids: Tuple[int, ...]  # tasks linking to this guide
+
+
+@dataclass(frozen=True)
+class Catalog:
+    version: int
+    modules: Tuple[CatalogModule, ...]  # sorted by order_index
+    modules_by_slug: Dict[str, CatalogModule]
+    modules_by_id: Dict[int, CatalogModule]
+    tasks_by_id: Dict[int, CatalogTask]
+    task_mask: int  # union of every module's task_mask
+    # Every task, best first, per onboarding profile (see app.utils.recommendations)
+    recommendation_orders: Dict[Profile, Tuple[CatalogTask, ...]]
+    guides: Tuple[CatalogGuide, ...]  # sorted by module order, essentials first, then title
+    guides_by_slug: Dict[str, CatalogGuide]
+    guides_by_id: Dict[int, CatalogGuide]
+    search_index: SearchIndex  # over task and guide text, see app.utils.search
+
+    @property
+    def total_tasks(self) -> int:
+        return len(self.tasks_by_id)
+
+
+def _task_mask(tasks) -> int:
+    mask = 0
+    for task in tasks:
+        mask |= 1 << task.id
+    return mask
+
+
+async def read_catalog_version(db: AsyncSession) -> int:
+    version = await db.scalar(select(CatalogVersion.version).where(CatalogVersion.id == 1))
+    return version or 0
+
+
+async def _read_catalog_version_once() -> int:
+    # The shared load can outlive the request that started it, so not its session
+    async with AsyncReadSessionLocal() as db:
+        return await read_catalog_version(db)
+
+
+def bump_catalog_version(db: Session) -> None:
+    """Mark the catalog as changed; call inside the transaction that changed it"""
+    updated = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == 1)
+        .values(version=CatalogVersion.version + 1)
+    ).rowcount
+    if not updated:
+        db.add(CatalogVersion(id=1, version=1))
+
+
+async def load_catalog(db: AsyncSession) -> Catalog:
+    version = await read_catalog_version(db)
+    modules = (await db.scalars(select(Module).order_by(Module.order_index))).all()
+    tasks = (await db.scalars(select(Task).order_by(Task.module_id, Task.order_index))).all()
+    # Plain rows rather than entities, so the markdown isn't held by the session
+    guides = (await db.execute(select(
+        Guide.id, Guide.module_id, Guide.slug, Guide.title, Guide.subtitle,
+        Guide.reading_time, Guide.is_essential, Guide.content
+    ))).all()
+
+    slugs_by_module_id = {module.id: module.slug for module in modules}
+    tasks_by_module_id: Dict[int, list] = {module.id: [] for module in modules}
+    tasks_by_id = {}
+
+    for task in tasks:
+        catalog_task = CatalogTask(
+            id=task.id,
+            module_id=task.module_id,
+            module_slug=slugs_by_module_id[task.module_id],
+            title=task.title,
+            description=task.description,
+            estimated_time=task.estimated_time,
+            difficulty=task.difficulty,
+            order_index=task.order_index,
+            guide_slug=task.guide_slug
+        )
+        tasks_by_module_id[task.module_id].append(catalog_task)
+        tasks_by_id[task.id] = catalog_task
+
+    catalog_modules = tuple(
+        CatalogModule(
+            id=module.id,
+            slug=module.slug,
+            name=module.name,
+            description=module.description,
+            icon=module.icon,
+            color=module.color,
+            order_index=module.order_index,
+            tasks=tuple(tasks_by_module_id[module.id]),
+            task_mask=_task_mask(tasks_by_module_id[module.id])
+        )
+        for module in modules
+    )
+
+    task_ids_by_guide: Dict[str, list] = {}
+    for task in tasks_by_id.values():
+        if task.guide_slug:
+            task_ids_by_guide.setdefault(task.guide_slug, []).append(task.id)
+
+    module_order = {module.id: module.order_index for module in modules}
+    catalog_guides = tuple(
+        CatalogGuide(
+            id=guide.id,
+            slug=guide.slug,
+            module_slug=slugs_by_module_id[guide.module_id],
+            title=guide.title,
+            subtitle=guide.subtitle,
+            reading_time=guide.reading_time,
+            is_essential=bool(guide.is_essential),
+            content_hash=hashlib.sha256(guide.content.encode()).hexdigest(),
+            task_ids=tuple(task_ids_by_guide.get(guide.slug, ()))
+        )
+        for guide in sorted(guides, key=lambda g: (module_order[g.module_id], not g.is_essential, g.title))
+    )
+    # Guide bodies are indexed here, while the rows are at hand
+    search_index = SearchIndex(
+        [
+            SearchDocument("task", task.id, {"title": task.title, "description": task.description})
+            for task in tasks_by_id.values()
+        ] + [
+            SearchDocument("guide", guide.id, {"title": guide.title, "subtitle": guide.subtitle, "content": guide.content})
+            for guide in guides
+        ]
+    )
+
+    return Catalog(
+        version=version,
+        modules=catalog_modules,
+        modules_by_slug={module.slug: module for module in catalog_modules},
+        modules_by_id={module.id: module for module in catalog_modules},
+        tasks_by_id=tasks_by_id,
+        task_mask=_task_mask(tasks_by_id.values()),
+        recommendation_orders=build_recommendation_orders(
+            tasks_by_id.values(),
+            {module.slug: module.order_index for module in modules}
+        ),
+        guides=catalog_guides,
+        guides_by_slug={guide.slug: guide for guide in catalog_guides},
+        guides_by_id={guide.id: guide for guide in catalog_guides},
+        search_index=search_index
+    )
+
+
+_catalog: Optional[Catalog] = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+
+
+async def refresh_catalog(db: AsyncSession) -> Catalog:
+    """(Re)load the catalog snapshot unconditionally"""
+    global _catalog, _checked_at
+    async with _lock:
+        _catalog = await load_catalog(db)
+        _checked_at = time.monotonic()
+        return _catalog
+
+
+async def get_catalog(db: AsyncSession) -> Catalog:
+    """Current catalog snapshot, reloaded when the version stamp changes.
+
+    The stamp is re-read at most every CATALOG_VERSION_CHECK_SECONDS, so the
+    common case touches no database at all.
+    """
+    global _catalog, _checked_at
+    catalog = _catalog
+    if catalog is None:
+        return await refresh_catalog(db)
+
+    if time.monotonic() - _checked_at < settings.CATALOG_VERSION_CHECK_SECONDS:
+        return catalog
+
+    async with _lock:
+        if _catalog is not catalog:
+            return _catalog
+        version = await catalog_version_cache.get_or_load("version", _read_catalog_version_once)
+        if version != catalog.version:
+            _catalog = await load_catalog(db)
+        _checked_at = time.monotonic()
+        return _catalog
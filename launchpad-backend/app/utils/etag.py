@@ -0,0 +1,43 @@
+"""Conditional GET for per-user views of the catalog.
+
+A response built only from the catalog and one user's completion state is
+fully determined by (catalog version, user id, progress version), so that
+triple is the ETag. A matching If-None-Match gets a 304 before any response
+body is built.
+"""
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def progress_etag(catalog_version: int, user_id: int, progress_version: int, variant: str = "") -> str:
+    """`variant` covers any other per-user input the body depends on"""
+    # Weak: the JSON is semantically, not byte-for-byte, stable
+    suffix = f"-{variant}" if variant else ""
+    return f'W/"c{catalog_version}-u{user_id}-p{progress_version}{suffix}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: ignore W/ prefixes on either side
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Always revalidate; the body is per user, so never share it
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Authorization"
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response if the client already has `etag`, else None"""
+    if not _matches(request.headers.get("if-none-match"), etag):
+        return None
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
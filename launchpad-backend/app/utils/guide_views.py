@@ -0,0 +1,121 @@
+"""Write-behind recording of guide views.
+
+Opening a guide only appends to an in-memory buffer. A background task
+flushes the buffer when it reaches GUIDE_VIEW_FLUSH_SIZE views or every
+GUIDE_VIEW_FLUSH_SECONDS: one multi-row INSERT into guide_views and one
+UPDATE ... FROM (VALUES ...) adding each guide's coalesced count to
+guides.view_count. Requests never wait on these writes.
+"""
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Integer, column, func, insert, update, values
+from sqlalchemy.exc import IntegrityError
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.guide import Guide
+from app.models.guide_view import GuideView
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+class GuideViewRecorder:
+    def __init__(self, flush_size: int, flush_seconds: float, max_buffer: int):
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._buffer: List[Tuple[int, int, datetime]] = []
+        self._flush_now = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, user_id: int, guide_id: int) -> None:
+        """Buffer one view; never blocks"""
+        if len(self._buffer) >= self.max_buffer:
+            # The database is falling behind; shed views rather than memory
+            self.dropped += 1
+            return
+        self._buffer.append((user_id, guide_id, datetime.now(timezone.utc)))
+        if len(self._buffer) >= self.flush_size:
+            self._flush_now.set()
+
+    def start(self) -> None:
+        self._stopping = False
+        # A fresh event per start: an event is bound to the loop that first
+        # waited on it, and each lifespan may run on a new one
+        self._flush_now = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still buffered"""
+        # Not cancelled: a flush in progress must finish, not lose its batch
+        self._stopping = True
+        self._flush_now.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+        views, self._buffer = self._buffer, []
+
+        # Sorted guide ids, so concurrent flushes from other workers lock
+        # guides rows in the same order
+        counts = sorted(Counter(guide_id for _, guide_id, _ in views).items())
+        increments = values(
+            column("guide_id", Integer),
+            column("views", Integer),
+            name="increments"
+        ).data(counts)
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(GuideView), [
+                    {"user_id": user_id, "guide_id": guide_id, "viewed_at": viewed_at}
+                    for user_id, guide_id, viewed_at in views
+                ])
+                await db.execute(
+                    update(Guide)
+                    .where(Guide.id == increments.c.guide_id)
+                    .values(
+                        view_count=func.coalesce(Guide.view_count, 0) + increments.c.views,
+                        # A view isn't an edit; keep updated_at as is
+                        updated_at=Guide.updated_at
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+        except IntegrityError:
+            # A guide or user was deleted meanwhile; retrying can't help
+            logger.exception("Dropped %d guide views", len(views))
+        except Exception:
+            logger.exception("Failed to flush %d guide views", len(views))
+            # Keep them for the next flush if there's room
+            room = self.max_buffer - len(self._buffer)
+            if room > 0:
+                self._buffer[:0] = views[:room]
+
+
+guide_view_recorder = GuideViewRecorder(
+    flush_size=settings.GUIDE_VIEW_FLUSH_SIZE,
+    flush_seconds=settings.GUIDE_VIEW_FLUSH_SECONDS,
+    max_buffer=settings.GUIDE_VIEW_MAX_BUFFER
+)
@@ -0,0 +1,147 @@
+"""Rendered guide bodies, built once per content hash.
+
+A guide's JSON body (metadata plus the markdown rendered to HTML) is encoded
+once and compressed once with gzip and brotli. The three byte strings are
+kept in a bounded cache keyed by a hash of everything that goes into the
+body, so requests only pick a pre-built representation. The same hash is
+the guide's strong ETag.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import brotli
+import markdown
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.guide import Guide
+from app.utils.cache import TTLCache
+from app.utils.catalog import Catalog, CatalogGuide
+
+settings = get_settings()
+
+WORDS_PER_MINUTE = 200
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists", "toc"]
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class RenderedGuide:
+    key: str
+    identity: bytes
+    gzip: bytes
+    br: bytes
+
+
+rendered_guides = TTLCache(maxsize=settings.GUIDE_CACHE_SIZE, ttl=settings.GUIDE_CACHE_TTL_SECONDS)
+_in_flight: Dict[str, asyncio.Future] = {}
+
+
+def estimate_reading_time(content: str) -> int:
+    """Minutes to read `content` at WORDS_PER_MINUTE, at least 1"""
+    return max(1, math.ceil(len(_WORD.findall(content)) / WORDS_PER_MINUTE))
+
+
+def representation_etag(key: str, encoding: str) -> str:
+    # Strong ETags are per representation, so each encoding gets its own
+    return f'"{key}"' if encoding == "identity" else f'"{key}-{encoding}"'
+
+
+def _metadata(guide: CatalogGuide, catalog: Catalog) -> dict:
+    return {
+        "id": guide.id,
+        "slug": guide.slug,
+        "module": guide.module_slug,
+        "title": guide.title,
+        "subtitle": guide.subtitle,
+        "reading_time": guide.reading_time,
+        "is_essential": guide.is_essential,
+        "tasks": [
+            {"id": task_id, "title": catalog.tasks_by_id[task_id].title}
+            for task_id in guide.task_ids
+        ],
+    }
+
+
+def guide_key(guide: CatalogGuide, catalog: Catalog) -> str:
+    """Hash of everything the rendered body is built from"""
+    digest = hashlib.sha256(guide.content_hash.encode())
+    digest.update(json.dumps(_metadata(guide, catalog), sort_keys=True).encode())
+    return digest.hexdigest()[:32]
+
+
+def _render(key: str, metadata: dict, content: str) -> RenderedGuide:
+    html = markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS)
+    body = json.dumps({**metadata, "html": html}, ensure_ascii=False, separators=(",", ":")).encode()
+    return RenderedGuide(
+        key=key,
+        identity=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0),
+        br=brotli.compress(body, quality=11, mode=brotli.MODE_TEXT),
+    )
+
+
+async def get_rendered_guide(db: AsyncSession, guide: CatalogGuide, catalog: Catalog, key: str) -> RenderedGuide:
+    rendered = rendered_guides.get(key)
+    if rendered is not None:
+        return rendered
+
+    # Concurrent misses for the same guide share one render
+    pending = _in_flight.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        content = await db.scalar(select(Guide.content).where(Guide.id == guide.id))
+        # Rendering and max-level compression are CPU work; keep them off the loop
+        rendered = await run_in_threadpool(_render, key, _metadata(guide, catalog), content or "")
+        rendered_guides.set(key, rendered)
+        future.set_result(rendered)
+        return rendered
+    except BaseException as e:
+        future.set_exception(e)
+        # Nobody may be waiting on it; don't warn about an unretrieved exception
+        future.exception()
+        raise
+    finally:
+        del _in_flight[key]
+
+
+def _qvalue(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 1.0
+    return 1.0
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> str:
+    """Best available coding the client accepts: br, then gzip, else identity.
+
+    A coding listed by name goes by its own q-value; `*` only covers codings
+    that aren't listed, so `br;q=0, *` still refuses br.
+    """
+    if not accept_encoding:
+        return "identity"
+    qvalues = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        qvalues[coding.strip().lower()] = _qvalue(params)
+    for coding in ("br", "gzip"):
+        if qvalues.get(coding, qvalues.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
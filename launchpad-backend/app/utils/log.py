@@ -0,0 +1,158 @@
+"""Queue-backed logging for the API.
+
+Request handlers only put the LogRecord on an in-memory queue; formatting and
+the stdout write happen on a QueueListener thread. Disabled levels cost one
+`isEnabledFor` check, and messages use lazy `%` arguments, so nothing is
+formatted for records that are gated or sampled away.
+"""
+import json
+import logging
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Loggers whose routine (below WARNING) records are emitted at LOG_SAMPLE_RATE
+SAMPLED_LOGGERS = ("app.utils.auth",)
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_listener: Optional[QueueListener] = None
+# Attached by configure_logging, taken off again by shutdown_logging
+_queue_handler: Optional[QueueHandler] = None
+_sampling_filters: Dict[str, logging.Filter] = {}
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id (runs on the caller's thread)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a random `rate` fraction of records below WARNING"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # The stock prepare() formats the message on the calling thread; the
+    # listener runs in this process, so hand the record over untouched
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging() -> None:
+    """Route the `app` logger tree through a queue to stdout.
+
+    Idempotent, and undone by shutdown_logging, so each lifespan can pair
+    the two.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    if settings.LOG_FORMAT == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s")
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+    _queue_handler.addFilter(RequestIdFilter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.LOG_LEVEL.upper())
+    app_logger.addHandler(_queue_handler)
+    app_logger.propagate = False
+
+    for name in SAMPLED_LOGGERS:
+        _sampling_filters[name] = SamplingFilter(settings.LOG_SAMPLE_RATE)
+        logging.getLogger(name).addFilter(_sampling_filters[name])
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Detach the queue handler, then drain the queue and stop the listener"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    # Detached first: nothing may land on the queue once it stops draining
+    app_logger = logging.getLogger("app")
+    app_logger.removeHandler(_queue_handler)
+    app_logger.propagate = True
+    for name, sampling_filter in _sampling_filters.items():
+        logging.getLogger(name).removeFilter(sampling_filter)
+    _sampling_filters.clear()
+    _queue_handler = None
+    _listener.stop()
+    _listener = None
+
+
+class RequestIdMiddleware:
+    """Pure ASGI middleware: bind an id to each request for log correlation.
+
+    Reuses the caller's `X-Request-ID` header when present and echoes the id
+    back on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,243 @@
+"""Per-request performance metrics in Prometheus text format.
+
+MetricsMiddleware times every request and, through cursor events on the
+database engine, counts the SQL statements it ran and the time spent in
+them. Totals are kept per route template (`/api/v1/modules/{slug}`, not the
+concrete path) so the label set stays bounded. Each response also carries a
+`Server-Timing` header with that request's own numbers.
+"""
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Seconds; tuned for an API whose healthy requests take a few milliseconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # One count per bucket, then +Inf, sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def collect(self):
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        for labels, series in sorted(snapshot.items()):
+            cumulative = 0
+            buckets = []
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                buckets.append((bound, cumulative))
+            yield labels, buckets, series[-1], cumulative
+
+
+class Counter:
+    def __init__(self):
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self):
+        with self._lock:
+            return sorted(self._values.items())
+
+
+request_duration = Histogram(LATENCY_BUCKETS)    # (method, route)
+requests_total = Counter()                       # (method, route, status)
+sql_queries_total = Counter()                    # (route,)
+sql_seconds_total = Counter()                    # (route,)
+pool_checkout_wait = Histogram(POOL_WAIT_BUCKETS)
+token_cache_hits_total = Counter()               # ()
+token_cache_misses_total = Counter()             # ()
+# Exported from the start, so a rate over them is defined before the first request
+token_cache_hits_total.inc((), 0)
+token_cache_misses_total.inc((), 0)
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    sql_seconds: float = 0.0
+
+
+# Stats of the request being handled; SQLAlchemy's async greenlets run in
+# the calling task's context, so the cursor events below see it
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.sql_seconds += time.perf_counter() - started
+
+
+def instrument_engine(engine) -> None:
+    """Attribute SQL statements run on `engine` (a sync Engine) to requests"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection"""
+
+    label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait.observe((self.label,), time.perf_counter() - started)
+
+
+class TimedReplicaPool(TimedAsyncAdaptedQueuePool):
+    label = "replica"
+
+
+def _route_template(scope) -> str:
+    # FastAPI records the matched route in the scope during routing
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: no per-request task or body buffering"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                server_timing = (
+                    f'app;dur={elapsed_ms:.1f}, '
+                    f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", server_timing.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            method = scope["method"]
+            route = _route_template(scope)
+            request_duration.observe((method, route), time.perf_counter() - started)
+            requests_total.inc((method, route, str(status_code)))
+            sql_queries_total.inc((route,), stats.queries)
+            sql_seconds_total.inc((route,), stats.sql_seconds)
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _render_histogram(lines, name, help_text, histogram, label_names):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, buckets, total, count in histogram.collect():
+        for bound, cumulative in buckets:
+            le = f'le="{_format_bound(bound)}"'
+            lines.append(f"{name}_bucket{_labels(label_names, labels, le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(label_names, labels)} {total}")
+        lines.append(f"{name}_count{_labels(label_names, labels)} {count}")
+
+
+def _render_counter(lines, name, help_text, counter, label_names):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, value in counter.collect():
+        lines.append(f"{name}{_labels(label_names, labels)} {value}")
+
+
+def _render_pool_gauge(lines, name, help_text, pools, value):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    for pool in pools:
+        lines.append(f"{name}{_labels(('pool',), (pool.label,))} {value(pool)}")
+
+
+def _capacity(pool) -> int:
+    return pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+
+
+def render_metrics(*pools) -> str:
+    """All metrics, plus current occupancy of each of `pools`, in Prometheus text format"""
+    lines = []
+    _render_histogram(lines, "launchpad_http_request_duration_seconds",
+                      "Request latency by route template.", request_duration, ("method", "route"))
+    _render_counter(lines, "launchpad_http_requests_total",
+                    "Requests by route template and status.", requests_total, ("method", "route", "status"))
+    _render_counter(lines, "launchpad_db_queries_total",
+                    "SQL statements executed, by route template.", sql_queries_total, ("route",))
+    _render_counter(lines, "launchpad_db_query_seconds_total",
+                    "Time spent executing SQL, by route template.", sql_seconds_total, ("route",))
+    _render_counter(lines, "launchpad_token_cache_hits_total",
+                    "Access tokens found in the verified-token cache.", token_cache_hits_total, ())
+    _render_counter(lines, "launchpad_token_cache_misses_total",
+                    "Access tokens not in the verified-token cache (fully decoded).", token_cache_misses_total, ())
+    _render_histogram(lines, "launchpad_db_pool_checkout_wait_seconds",
+                      "Time spent waiting for a pooled connection.", pool_checkout_wait, ("pool",))
+
+    _render_pool_gauge(lines, "launchpad_db_pool_size", "Configured pool size.", pools,
+                       lambda pool: pool.size())
+    _render_pool_gauge(lines, "launchpad_db_pool_capacity", "Pool size plus max overflow.", pools, _capacity)
+    _render_pool_gauge(lines, "launchpad_db_pool_checked_out", "Connections currently in use.", pools,
+                       lambda pool: pool.checkedout())
+    _render_pool_gauge(lines, "launchpad_db_pool_idle", "Connections idle in the pool.", pools,
+                       lambda pool: pool.checkedin())
+    _render_pool_gauge(lines, "launchpad_db_pool_overflow", "Connections open beyond the pool size.", pools,
+                       lambda pool: max(pool.overflow(), 0))
+    _render_pool_gauge(lines, "launchpad_db_pool_saturation", "Checked-out connections / capacity.", pools,
+                       lambda pool: round(pool.checkedout() / _capacity(pool), 4) if _capacity(pool) else 0)
+    return "\n".join(lines) + "\n"
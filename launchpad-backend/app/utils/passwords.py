@@ -0,0 +1,98 @@
+"""Argon2 hashing on a dedicated, bounded process pool.
+
+Argon2 costs tens of milliseconds of CPU per call. Running it in the shared
+anyio threadpool lets a burst of logins starve every other request, so it
+runs in its own worker processes instead. At most PASSWORD_HASH_MAX_PENDING
+calls may be queued or running per API worker; beyond that callers get a
+503 straight away rather than waiting behind the backlog.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+@lru_cache(maxsize=4)
+def _context(time_cost: int, memory_cost: int, parallelism: int) -> CryptContext:
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__time_cost=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism
+    )
+
+
+def _params() -> Tuple[int, int, int]:
+    return (settings.ARGON2_TIME_COST, settings.ARGON2_MEMORY_COST, settings.ARGON2_PARALLELISM)
+
+
+def password_context() -> CryptContext:
+    """CryptContext for the configured Argon2 parameters (for in-process use)"""
+    return _context(*_params())
+
+
+# Run inside the pool workers; parameters travel with each call so workers
+# never depend on their own copy of the settings
+def _hash(password: str, params: Tuple[int, int, int]) -> str:
+    return _context(*params).hash(password)
+
+
+def _verify_and_update(password: str, hashed: str, params: Tuple[int, int, int]) -> Tuple[bool, Optional[str]]:
+    return _context(*params).verify_and_update(password, hashed)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+
+def start_password_pool() -> None:
+    global _executor
+    if _executor is None:
+        # spawn: don't fork a process that already has an event loop and threads
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+
+def shutdown_password_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+async def _run(fn, *args):
+    global _pending
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"}
+        )
+
+    start_password_pool()
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password, _params())
+
+
+async def verify_password(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """Check a password. When the stored hash used different Argon2 parameters,
+    also returns a fresh hash that the caller should store."""
+    return await _run(_verify_and_update, password, hashed, _params())
@@ -0,0 +1,200 @@
+"""Per-user completion state as a bitmap indexed by task id.
+
+`user_completion_bitmaps` mirrors `user_task_progress.completed`: bit n is
+set when task n is completed. Task ids are never reused, so they double as
+stable ordinals. Progress for a module is then a popcount of the bitmap
+masked with the module's task mask from the catalog.
+"""
+from sqlalchemy import Boolean, Integer, case, column, func, literal, select, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Sequence, Tuple
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.user_completion_bitmap import UserCompletionBitmap
+from app.models.user_task_progress import UserTaskProgress
+from app.utils.shared_cache import SharedCache
+
+settings = get_settings()
+
+# (bits, progress version) per user; see get_cached_completion_state
+completion_cache = SharedCache("progress", ttl=settings.PROGRESS_CACHE_TTL_SECONDS)
+
+# Invalidation has to reach every worker, and the memory backend only
+# reaches the one that handled the write
+COMPLETION_CACHE_ENABLED = settings.CACHE_BACKEND != "memory"
+
+
+def bitmap_to_int(bitmap: bytes) -> int:
+    return int.from_bytes(bitmap, "little")
+
+
+def int_to_bitmap(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def is_completed(bits: int, task_id: int) -> bool:
+    return (bits >> task_id) & 1 == 1
+
+
+def count_completed(bits: int, mask: int) -> int:
+    return (bits & mask).bit_count()
+
+
+async def get_completion_bits(db: AsyncSession, user_id: int) -> int:
+    """The user's completion bitmap as an int (0 if they never completed anything)"""
+    bits, _ = await get_completion_state(db, user_id)
+    return bits
+
+
+async def get_completion_state(db: AsyncSession, user_id: int) -> Tuple[int, int]:
+    """The user's completion bitmap as an int, and its progress version.
+
+    Both are 0 for a user who never completed anything.
+    """
+    row = (await db.execute(
+        select(UserCompletionBitmap.bitmap, UserCompletionBitmap.progress_version)
+        .where(UserCompletionBitmap.user_id == user_id)
+    )).first()
+    if row is None:
+        return 0, 0
+    return bitmap_to_int(row.bitmap), row.progress_version
+
+
+async def get_cached_completion_state(user_id: int) -> Tuple[int, int]:
+    """get_completion_state through the shared cache.
+
+    With the memory backend the cache is skipped and every call reads the
+    primary. Completion writes must call invalidate_completion_state after
+    commit.
+    """
+    async def load():
+        # Read the primary: a lagging replica's state must not be cached as
+        # current. A session of its own, see SharedCache.get_or_load.
+        async with AsyncSessionLocal() as db:
+            return await get_completion_state(db, user_id)
+
+    if not COMPLETION_CACHE_ENABLED:
+        return await load()
+    return await completion_cache.get_or_load(str(user_id), load, group=str(user_id))
+
+
+async def invalidate_completion_state(user_id: int) -> None:
+    if COMPLETION_CACHE_ENABLED:
+        await completion_cache.bump(str(user_id))
+
+
+def completion_bits_upsert(user_id: int, changes: Sequence[Tuple[int, bool]]):
+    """Upsert statement that sets/clears each (task_id, completed) bit.
+
+    Runs as a single statement so concurrent toggles for the same user
+    serialize on the bitmap row instead of overwriting each other. Also bumps
+    the row's progress_version.
+    """
+    byte_length = max(task_id for task_id, _ in changes) // 8 + 1
+    current = UserCompletionBitmap.bitmap
+
+    # Grow the stored bitmap with zero bytes when a task id is past its end
+    bitmap = case(
+        (
+            func.length(current) < byte_length,
+            current.op("||")(func.decode(func.repeat("00", byte_length - func.length(current)), "hex"))
+        ),
+        else_=current
+    )
+    initial = 0
+    for task_id, completed in changes:
+        bitmap = func.set_bit(bitmap, task_id, 1 if completed else 0)
+        if completed:
+            initial |= 1 << task_id
+        else:
+            initial &= ~(1 << task_id)
+
+    return insert(UserCompletionBitmap).values(
+        user_id=user_id,
+        bitmap=int_to_bitmap(initial),
+        progress_version=1
+    ).on_conflict_do_update(
+        index_elements=[UserCompletionBitmap.user_id],
+        set_={
+            "bitmap": bitmap,
+            "progress_version": UserCompletionBitmap.progress_version + 1,
+            "updated_at": func.now()
+        }
+    )
+
+
+async def upsert_task_completion(db: AsyncSession, user_id: int, task_id: int, completed: bool):
+    """Write one task's completion and its bitmap bit in a single round trip.
+
+    Returns the stored (task_id, completed, completed_at) row. `task_id`
+    must be a catalog task: the bitmap is sized and shifted by it.
+    """
+    progress = insert(UserTaskProgress).values(
+        user_id=user_id,
+        task_id=task_id,
+        completed=completed,
+        completed_at=func.now() if completed else None
+    )
+    progress = progress.on_conflict_do_update(
+        constraint="unique_user_task",
+        set_={
+            "completed": progress.excluded.completed,
+            "completed_at": progress.excluded.completed_at,
+            "updated_at": func.now()
+        }
+    ).returning(
+        UserTaskProgress.task_id,
+        UserTaskProgress.completed,
+        UserTaskProgress.completed_at
+    ).cte("progress")
+
+    bitmap = completion_bits_upsert(user_id, [(task_id, completed)]).cte("bitmap")
+
+    result = await db.execute(select(progress).add_cte(bitmap))
+    return result.one()
+
+
+async def upsert_task_completions(db: AsyncSession, user_id: int, changes: Sequence[Tuple[int, bool]]):
+    """Write many (task_id, completed) changes with one multi-row upsert.
+
+    Every task id must be a catalog task; callers filter out the others and
+    report them as not found. Returns the stored (task_id, completed,
+    completed_at) rows; the caller commits.
+    """
+    # Lock rows in task id order so overlapping batches can't deadlock
+    changes = sorted(changes)
+    requested = values(
+        column("task_id", Integer),
+        column("completed", Boolean),
+        name="requested"
+    ).data(changes)
+
+    rows = select(
+        literal(user_id),
+        requested.c.task_id,
+        requested.c.completed,
+        case((requested.c.completed, func.now()), else_=None)
+    ).select_from(requested)
+
+    stmt = insert(UserTaskProgress).from_select(
+        ["user_id", "task_id", "completed", "completed_at"], rows
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="unique_user_task",
+        set_={
+            "completed": stmt.excluded.completed,
+            "completed_at": stmt.excluded.completed_at,
+            "updated_at": func.now()
+        }
+    ).returning(
+        UserTaskProgress.task_id,
+        UserTaskProgress.completed,
+        UserTaskProgress.completed_at
+    )
+
+    stored = (await db.execute(stmt)).all()
+    if stored:
+        await db.execute(completion_bits_upsert(user_id, [(row.task_id, row.completed) for row in stored]))
+    return stored
@@ -0,0 +1,207 @@
+"""Progress deltas pushed to a user's open streams (GET /progress/stream).
+
+After a completion commit, `progress_broker.publish` sends a small JSON
+message (the changed tasks) through the fan-out chosen by PROGRESS_FANOUT:
+
+- "local": straight back to this worker's subscribers. Enough for one
+  worker, or with sticky routing per user.
+- "postgres": NOTIFY on the primary, which every worker LISTENs to, so a
+  toggle on one worker reaches streams held by the others.
+
+Each worker keeps its subscribers in memory, keyed by user id, so a
+message for a user with no stream open here is dropped without being
+parsed. A subscriber that falls behind, or a listener that lost its
+connection, gets a "resync" instead of the missed deltas: the client then
+refetches, which is a 304 when nothing changed.
+"""
+import asyncio
+import logging
+from contextlib import contextmanager, suppress
+from typing import Callable, Dict, Optional, Sequence, Set
+
+import asyncpg
+from pydantic_core import to_json
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+
+from app.config import get_settings
+from app.database import async_engine
+from app.utils.catalog import Catalog
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the deltas a subscriber missed
+RESYNC = object()
+
+# NOTIFY payloads must stay under 8000 bytes; ~80 bytes per change
+MAX_CHANGES_PER_MESSAGE = 50
+
+Deliver = Callable[[str], None]
+
+
+class LocalFanout:
+    """Delivers to this worker only"""
+
+    async def start(self, deliver: Deliver, lost: Callable[[], None]) -> None:
+        self._deliver = deliver
+
+    async def publish(self, message: str) -> None:
+        self._deliver(message)
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresFanout:
+    """LISTEN/NOTIFY on the primary.
+
+    Publishing borrows a pooled connection. Listening needs a connection of
+    its own for the worker's lifetime, opened with asyncpg directly; if it
+    drops it is reopened, and subscribers are told to resync because
+    notifications sent meanwhile are lost.
+    """
+
+    CHANNEL = "progress_events"
+    RECONNECT_SECONDS = 1.0
+
+    def __init__(self, engine):
+        self.engine = engine
+        url = make_url(engine.url)
+        # asyncpg takes a plain postgresql:// DSN
+        self.dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._connection = None
+        self._reconnect: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def start(self, deliver: Deliver, lost: Callable[[], None]) -> None:
+        self._deliver = deliver
+        self._lost = lost
+        self._stopping = False
+        await self._listen()
+
+    async def _listen(self) -> None:
+        self._connection = await asyncpg.connect(self.dsn)
+        await self._connection.add_listener(self.CHANNEL, self._on_notify)
+        self._connection.add_termination_listener(self._on_terminated)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self._deliver(payload)
+
+    def _on_terminated(self, connection) -> None:
+        if self._stopping or self._reconnect is not None:
+            return
+        logger.warning("Progress event listener disconnected; reconnecting")
+        self._reconnect = asyncio.get_running_loop().create_task(self._run_reconnect())
+
+    async def _run_reconnect(self) -> None:
+        try:
+            while not self._stopping:
+                await asyncio.sleep(self.RECONNECT_SECONDS)
+                try:
+                    await self._listen()
+                except (OSError, asyncpg.PostgresError) as e:
+                    logger.warning("Progress event listener reconnect failed: %s", e)
+                    continue
+                self._lost()
+                return
+        finally:
+            self._reconnect = None
+
+    async def publish(self, message: str) -> None:
+        async with self.engine.connect() as conn:
+            await conn.execute(select(func.pg_notify(self.CHANNEL, message)))
+            await conn.commit()
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reconnect
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+
+def create_fanout():
+    if settings.PROGRESS_FANOUT == "local":
+        return LocalFanout()
+    if settings.PROGRESS_FANOUT == "postgres":
+        return PostgresFanout(async_engine)
+    raise ValueError(f"Unknown PROGRESS_FANOUT {settings.PROGRESS_FANOUT!r}")
+
+
+class ProgressBroker:
+    def __init__(self, fanout, queue_size: int):
+        self.fanout = fanout
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+
+    async def start(self) -> None:
+        await self.fanout.start(self._deliver, self._resync_all)
+
+    async def stop(self) -> None:
+        await self.fanout.stop()
+
+    @contextmanager
+    def subscribe(self, user_id: int):
+        """Queue of the user's messages (JSON strings, or RESYNC) while open"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers[user_id]
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    async def publish(self, user_id: int, catalog: Catalog, stored: Sequence) -> None:
+        """Announce committed (task_id, completed, completed_at) rows.
+
+        Never raises: the write it reports has already committed.
+        """
+        changes = []
+        for row in stored:
+            task = catalog.tasks_by_id.get(row.task_id)
+            changes.append({
+                "task_id": row.task_id,
+                "module": task.module_slug if task else None,
+                "completed": row.completed,
+                "completed_at": row.completed_at.isoformat() if row.completed_at else None
+            })
+        try:
+            for start in range(0, len(changes), MAX_CHANGES_PER_MESSAGE):
+                body = to_json({"changes": changes[start:start + MAX_CHANGES_PER_MESSAGE]}).decode()
+                # User id first, so workers route without parsing the body
+                await self.fanout.publish(f"{user_id} {body}")
+        except Exception:
+            logger.exception("Failed to publish progress event for user %d", user_id)
+
+    def _deliver(self, message: str) -> None:
+        user_id, _, body = message.partition(" ")
+        queues = self._subscribers.get(int(user_id))
+        if not queues:
+            return
+        for queue in queues:
+            self._put(queue, body)
+
+    def _resync_all(self) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._put(queue, RESYNC)
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, item) -> None:
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            # A slow client: replace its backlog with one resync
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+
+
+progress_broker = ProgressBroker(create_fanout(), queue_size=settings.PROGRESS_STREAM_QUEUE_SIZE)
@@ -0,0 +1,95 @@
+"""Response bodies built from the catalog and one user's completion bitmap.
+
+/modules, /progress and /dashboard all show per-module counts. They are
+computed once per request (one popcount per module) by `module_counts` and
+shaped by the builders below, so the three endpoints can't drift apart.
+"""
+from typing import List, Tuple
+
+from app.models.user import User
+from app.utils.catalog import Catalog, CatalogModule
+from app.utils.progress import count_completed
+from app.utils.recommendations import recommend_tasks
+
+RECOMMENDED_TASKS_LIMIT = 3
+
+ModuleCounts = List[Tuple[CatalogModule, int]]  # (module, completed tasks), in catalog order
+
+
+def module_counts(catalog: Catalog, completion_bits: int) -> ModuleCounts:
+    return [(module, count_completed(completion_bits, module.task_mask)) for module in catalog.modules]
+
+
+def module_cards(counts: ModuleCounts) -> List[dict]:
+    """GET /modules items (ModuleCard)"""
+    cards = []
+    for module, completed_tasks in counts:
+        total_tasks = len(module.tasks)
+        progress_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+
+        cards.append({
+            "id": module.id,
+            "name": module.name,
+            "slug": module.slug,
+            "description": module.description,
+            "icon": module.icon,
+            "color": module.color,
+            "order": module.order_index,  # FIXED: use order_index
+            "completed_tasks": completed_tasks,
+            "total_tasks": total_tasks,
+            "progress_percentage": round(progress_percentage, 1)
+        })
+    return cards
+
+
+def module_progress(counts: ModuleCounts) -> List[dict]:
+    """ProgressOverview.modules items (ModuleProgress)"""
+    progress = []
+    for module, module_completed in counts:
+        module_total = len(module.tasks)
+        module_percentage = int((module_completed / module_total * 100)) if module_total > 0 else 0
+
+        progress.append({
+            "slug": module.slug,
+            "name": module.name,
+            "total_tasks": module_total,
+            "completed_tasks": module_completed,
+            "progress_percentage": module_percentage
+        })
+    return progress
+
+
+def overall_progress(catalog: Catalog, counts: ModuleCounts) -> dict:
+    total_tasks = catalog.total_tasks
+    completed_tasks = sum(completed for _, completed in counts)
+    return {
+        "total_tasks": total_tasks,
+        "completed_tasks": completed_tasks,
+        "progress_percentage": int((completed_tasks / total_tasks * 100)) if total_tasks > 0 else 0
+    }
+
+
+def recommended_tasks(catalog: Catalog, completion_bits: int, user: User) -> List[dict]:
+    """The first incomplete tasks in the order precomputed for the user's
+    onboarding profile (RecommendedTask)"""
+    return [
+        {
+            "id": task.id,
+            "title": task.title,
+            "module": task.module_slug,
+            "difficulty": task.difficulty,
+            "estimated_time": task.estimated_time
+        }
+        for task in recommend_tasks(
+            catalog.recommendation_orders,
+            completion_bits,
+            user.biggest_challenge,
+            user.life_stage,
+            RECOMMENDED_TASKS_LIMIT
+        )
+    ]
+
+
+def recommendation_variant(user: User) -> str:
+    """ETag variant for bodies containing recommended_tasks"""
+    return f"{user.biggest_challenge or ''}.{user.life_stage or ''}"
@@ -0,0 +1,88 @@
+"""Next-task recommendations, ranked per onboarding profile.
+
+A profile is a user's (biggest_challenge, life_stage) pair, and there are
+only a handful of them, so every task is scored once per profile when the
+catalog snapshot is built. A request walks its profile's precomputed order
+and skips completed tasks; nothing is sorted per request.
+"""
+import itertools
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.utils.progress import is_completed
+
+# Mirrors the OnboardingComplete choices; None is a user who skipped onboarding
+CHALLENGES = ("money", "housing", "taxes", "all")
+LIFE_STAGES = ("college", "graduated", "first_job", "working")
+
+Profile = Tuple[Optional[str], Optional[str]]
+
+DIFFICULTY_WEIGHTS = {"easy": 1.0, "medium": 2.0, "hard": 3.0}
+UNKNOWN_DIFFICULTY_WEIGHT = 2.0
+# Open-ended tasks ("build an emergency fund") have no estimate; rank them
+# like a long one rather than like a free one
+UNKNOWN_TIME_MINUTES = 120
+
+# Tasks in the module the user said they struggle with come first
+CHALLENGE_BONUS = 3.0
+# Which modules matter most at each stage, and how much a harder task
+# should hold back a recommendation (students get quick wins first)
+LIFE_STAGE_MODULE_BONUS: Dict[str, Dict[str, float]] = {
+    "college": {"money": 1.0},
+    "graduated": {"housing": 1.0, "money": 0.5},
+    "first_job": {"taxes": 1.0, "money": 0.5},
+    "working": {"taxes": 0.5, "housing": 0.5},
+}
+LIFE_STAGE_DIFFICULTY_SENSITIVITY = {"college": 1.5, "graduated": 1.0, "first_job": 1.0, "working": 0.75}
+
+
+def task_score(task, challenge: Optional[str], life_stage: Optional[str]) -> float:
+    """Higher is recommended sooner"""
+    score = 0.0
+    if challenge == task.module_slug:
+        score += CHALLENGE_BONUS
+    score += LIFE_STAGE_MODULE_BONUS.get(life_stage, {}).get(task.module_slug, 0.0)
+
+    difficulty = DIFFICULTY_WEIGHTS.get(task.difficulty, UNKNOWN_DIFFICULTY_WEIGHT)
+    score -= difficulty * LIFE_STAGE_DIFFICULTY_SENSITIVITY.get(life_stage, 1.0)
+
+    # Diminishing: 5 vs 15 minutes matters more than 60 vs 70
+    minutes = task.estimated_time if task.estimated_time is not None else UNKNOWN_TIME_MINUTES
+    score -= math.log1p(minutes) / 2
+    return score
+
+
+def build_recommendation_orders(tasks: Iterable, module_order: Dict[str, int]) -> Dict[Profile, tuple]:
+    """Every task, best first, for each possible profile"""
+    tasks = tuple(tasks)
+    orders = {}
+    for challenge, life_stage in itertools.product(CHALLENGES + (None,), LIFE_STAGES + (None,)):
+        orders[(challenge, life_stage)] = tuple(sorted(
+            tasks,
+            # Ties follow the catalog's own order
+            key=lambda t: (-task_score(t, challenge, life_stage), module_order[t.module_slug], t.order_index, t.id)
+        ))
+    return orders
+
+
+def recommend_tasks(
+    orders: Dict[Profile, tuple],
+    completion_bits: int,
+    challenge: Optional[str],
+    life_stage: Optional[str],
+    limit: int
+) -> List:
+    """The first `limit` incomplete tasks in the profile's order"""
+    # Anything outside the onboarding choices ranks as if not answered
+    order = orders[(
+        challenge if challenge in CHALLENGES else None,
+        life_stage if life_stage in LIFE_STAGES else None
+    )]
+    recommended = []
+    for task in order:
+        if is_completed(completion_bits, task.id):
+            continue
+        recommended.append(task)
+        if len(recommended) == limit:
+            break
+    return recommended
@@ -0,0 +1,86 @@
+"""Refresh token storage, rotation and expiry purge.
+
+Only a sha256 digest of each refresh token is stored, so lookups hit a
+fixed-size unique index and a leaked table dump can't be replayed.
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.refresh_token import RefreshToken
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def store_refresh_token(db: AsyncSession, user_id: int, token: str, expire_days: int) -> None:
+    """Add the token's row to the session; the caller commits"""
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        expires_at=datetime.utcnow() + timedelta(days=expire_days)
+    ))
+
+
+async def consume_refresh_token(db: AsyncSession, token: str) -> Optional[int]:
+    """Delete a live refresh token and return its user id.
+
+    The delete is the check: a token can be redeemed exactly once, even by
+    two concurrent refresh calls.
+    """
+    return await db.scalar(
+        delete(RefreshToken)
+        .where(
+            RefreshToken.token_hash == hash_refresh_token(token),
+            RefreshToken.expires_at > func.now()
+        )
+        .returning(RefreshToken.user_id)
+    )
+
+
+async def purge_expired_refresh_tokens(batch_size: int) -> int:
+    """Delete expired rows in batches of `batch_size`, one short transaction each"""
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            expired_ids = (
+                select(RefreshToken.id)
+                .where(RefreshToken.expires_at < func.now())
+                .order_by(RefreshToken.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+            result = await db.execute(delete(RefreshToken).where(RefreshToken.id.in_(expired_ids)))
+            await db.commit()
+
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+        # Give other writers a turn between batches
+        await asyncio.sleep(0)
+
+
+async def run_refresh_token_sweeper() -> None:
+    """Background task: purge expired refresh tokens every interval"""
+    while True:
+        try:
+            purged = await purge_expired_refresh_tokens(settings.REFRESH_TOKEN_PURGE_BATCH_SIZE)
+            if purged:
+                logger.info("Purged %d expired refresh tokens", purged)
+        except Exception:
+            logger.exception("Refresh token purge failed")
+        await asyncio.sleep(settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS)
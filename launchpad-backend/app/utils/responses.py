@@ -0,0 +1,87 @@
+"""JSON responses encoded once, straight to bytes.
+
+When a handler returns a dict, FastAPI validates it against the
+response_model, runs jsonable_encoder and json.dumps the result. Our read
+handlers build their bodies from the catalog and plain database values,
+already in the shape of a schema in app/schemas/. They return
+`schema_response(body, Schema)` instead, which pydantic-core encodes in one
+native pass with the schema's own serializer, so field aliases and
+exclusions still apply. The route keeps `response_model=Schema` so the body
+is still documented in OpenAPI.
+
+With VALIDATE_RESPONSES the body is also validated against the schema, so
+a handler drifting from its schema fails in development rather than in a
+client. It is off by default: validating every response is the cost this
+module exists to avoid.
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import SchemaSerializer
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# What FastAPI's default path does for a response_model (response_model_by_alias)
+BY_ALIAS = True
+
+_FIELD_KEYS = ("schema", "serialization_alias", "serialization_exclude", "metadata")
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def _models_as_dicts(node: Any) -> Any:
+    """`node` (a core schema) with every model read as a typed dict.
+
+    A model's serializer only accepts instances of the model; a typed dict
+    with the same fields serializes a plain dict the same way.
+    """
+    if isinstance(node, list):
+        return [_models_as_dicts(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if node.get("type") != "model":
+        return {key: _models_as_dicts(value) for key, value in node.items()}
+
+    fields = node["schema"]
+    if "serialization" in node or fields.get("computed_fields"):
+        raise TypeError(f"{node.get('cls')} has custom serialization; return the model instead")
+    typed_dict = {
+        "type": "typed-dict",
+        "fields": {
+            name: {"type": "typed-dict-field", **{key: _models_as_dicts(field[key]) for key in _FIELD_KEYS if key in field}}
+            for name, field in fields["fields"].items()
+        }
+    }
+    if "ref" in node:
+        typed_dict["ref"] = node["ref"]
+    return typed_dict
+
+
+@lru_cache(maxsize=None)
+def _serializer(schema: Any) -> SchemaSerializer:
+    return SchemaSerializer(_models_as_dicts(_adapter(schema).core_schema))
+
+
+def schema_response(content: Any, schema: Any, response: Optional[Response] = None) -> Response:
+    """`content` (JSON-ready values matching `schema`) as a ready-to-send response.
+
+    Pass the handler's injected `response` to keep headers set on it (ETag
+    and the like); FastAPI doesn't merge them into a returned Response.
+    """
+    if settings.VALIDATE_RESPONSES:
+        adapter = _adapter(schema)
+        body = adapter.dump_json(adapter.validate_python(content, strict=True), by_alias=BY_ALIAS)
+    else:
+        body = _serializer(schema).to_json(content, by_alias=BY_ALIAS)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers=dict(response.headers) if response is not None else None
+    )
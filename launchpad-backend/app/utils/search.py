@@ -0,0 +1,154 @@
+"""In-process full-text index over the catalog's tasks and guides.
+
+Built together with each catalog snapshot (so it is rebuilt exactly when the
+catalog version changes) and queried without touching the database. Scoring
+is BM25 over field-weighted term frequencies: a word in a title counts more
+than one in a guide body. Every query term must match; each also matches
+longer words it is a prefix of, at a discount, so partial input like
+"emerg fun" finds "emergency fund".
+"""
+import bisect
+import heapq
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+FIELD_WEIGHTS = {"title": 3.0, "subtitle": 2.0, "description": 1.0, "content": 1.0}
+PREFIX_WEIGHT = 0.7   # score multiplier for a prefix (not exact) match
+MIN_PREFIX_LENGTH = 2
+# Short prefixes expand to many terms, so their merged postings are built
+# with the index; longer ones are expanded per query (up to the cap)
+PRECOMPUTED_PREFIX_LENGTH = 3
+MAX_PREFIX_EXPANSIONS = 50
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from how i if in into is it of on or so that the "
+    "this to was what when where which who why will with you your".split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    # Fold accents and case so "Résumé" matches "resume"
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    return [token for token in _TOKEN.findall(folded) if token not in STOP_WORDS]
+
+
+def _merge_max(target: Dict[int, float], scores: Dict[int, float], multiplier: float) -> None:
+    for doc, score in scores.items():
+        score *= multiplier
+        if score > target.get(doc, 0.0):
+            target[doc] = score
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    kind: str  # "task" | "guide"
+    id: int
+    fields: Dict[str, Optional[str]]  # field name -> text, see FIELD_WEIGHTS
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str
+    id: int
+    score: float
+
+
+class SearchIndex:
+    def __init__(self, documents: Iterable[SearchDocument]):
+        self._docs: List[Tuple[str, int]] = []
+        lengths: List[float] = []
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+
+        for doc_index, document in enumerate(documents):
+            self._docs.append((document.kind, document.id))
+            length = 0.0
+            for field, text in document.fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    doc_postings = postings[token]
+                    doc_postings[doc_index] = doc_postings.get(doc_index, 0.0) + weight
+                    length += weight
+            lengths.append(length)
+
+        # BM25 is fully determined at build time, so each posting stores its
+        # final (doc, score) and a query only sums
+        count = len(self._docs)
+        average = (sum(lengths) / count) if count else 1.0
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / (average or 1.0)) for length in lengths]
+        self._postings: Dict[str, Dict[int, float]] = {}
+        for term, docs in postings.items():
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            self._postings[term] = {
+                doc: idf * frequency * (BM25_K1 + 1) / (frequency + norms[doc])
+                for doc, frequency in docs.items()
+            }
+        self._terms = sorted(self._postings)
+
+        # prefix -> best discounted score per doc over the longer terms it starts
+        self._prefixes: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for term, docs in self._postings.items():
+            for length in range(MIN_PREFIX_LENGTH, min(len(term), PRECOMPUTED_PREFIX_LENGTH + 1)):
+                _merge_max(self._prefixes[term[:length]], docs, PREFIX_WEIGHT)
+        self._prefixes = dict(self._prefixes)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def _prefix_scores(self, token: str) -> Dict[int, float]:
+        if len(token) < MIN_PREFIX_LENGTH:
+            return {}
+        if len(token) <= PRECOMPUTED_PREFIX_LENGTH:
+            return self._prefixes.get(token, {})
+        scores: Dict[int, float] = {}
+        start = bisect.bisect_right(self._terms, token)
+        for term in self._terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            _merge_max(scores, self._postings[term], PREFIX_WEIGHT)
+        return scores
+
+    def _token_scores(self, token: str) -> Dict[int, float]:
+        """Per-doc score of the best match for `token`, exact or as a prefix.
+
+        May return an index-owned dict; callers must not modify it.
+        """
+        exact = self._postings.get(token, {})
+        prefix = self._prefix_scores(token)
+        if not prefix:
+            return exact
+        if not exact:
+            return prefix
+        merged = dict(prefix)
+        _merge_max(merged, exact, 1.0)
+        return merged
+
+    def search(self, query: str, limit: int = 20, kinds: Optional[Sequence[str]] = None) -> List[SearchHit]:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        # Every term must match: intersect starting from the rarest
+        scored = sorted((self._token_scores(token) for token in tokens), key=len)
+        totals = scored[0]
+        for scores in scored[1:]:
+            totals = {doc: score + scores[doc] for doc, score in totals.items() if doc in scores}
+            if not totals:
+                return []
+
+        candidates = totals.items()
+        if kinds is not None:
+            candidates = [(doc, score) for doc, score in candidates if self._docs[doc][0] in kinds]
+        # Only the top `limit` become hits; ties keep index order
+        top = heapq.nlargest(limit, candidates, key=itemgetter(1))
+        return [SearchHit(kind=self._docs[doc][0], id=self._docs[doc][1], score=score) for doc, score in top]
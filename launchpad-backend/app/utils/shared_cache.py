@@ -0,0 +1,541 @@
+"""Cache shared by all workers, behind a pluggable backend.
+
+A cache kept in a module global is per worker: each uvicorn worker fills
+its own copy and evicts its own copy. `SharedCache` puts values in a
+backend chosen by CACHE_BACKEND instead:
+
+- "memory": a dict in this process (the old per-worker behaviour)
+- "mmap": a fixed-size hash table in a memory-mapped file (CACHE_MMAP_PATH,
+  on tmpfs by default) shared by the workers on one host
+- "redis": any server speaking the Redis protocol (CACHE_URL), shared by
+  every host
+
+Values are pickled and expire after a TTL. Keys can be versioned: a
+namespace's `bump(group)` moves every key stored under `group` to a new
+version at once, so an invalidation can't be undone by a request that read
+the old data just before it. Versions are random tokens rather than
+counters, so a version key that was evicted or expired never comes back as
+an old version. `get_or_load` is single-flight: concurrent
+misses for one key share a single load in a worker, and across workers one
+loads while the others briefly wait for its result.
+
+The cache is an optimization. Backend errors are logged and treated as
+misses, never raised to the request, and after one the backend is skipped
+for CACHE_BREAKER_SECONDS (see CircuitBreaker).
+"""
+import asyncio
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import secrets
+import struct
+import time
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import unquote, urlparse
+
+from app.config import get_settings
+from app.utils.cache import TTLCache
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# A worker that finds another one loading a key polls for its result this
+# long before loading it itself
+LOAD_LOCK_SECONDS = 2.0
+LOAD_POLL_SECONDS = 0.01
+# Versions outlive any entry stored under them
+VERSION_TTL_SECONDS = 7 * 24 * 3600
+
+
+class CacheError(Exception):
+    pass
+
+
+class CacheUnavailable(CacheError):
+    """Raised without trying while the circuit breaker is open"""
+
+
+class MemoryBackend:
+    """Per-process backend; what every cache here used before"""
+
+    def __init__(self, maxsize: int):
+        self._data = TTLCache(maxsize=maxsize, ttl=float("inf"))
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._data.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None, only_if_missing: bool = False) -> bool:
+        if only_if_missing and self._data.get(key) is not None:
+            return False
+        self._data.set(key, value, ttl=float("inf") if ttl is None else ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key)
+
+    async def close(self) -> None:
+        self._data.clear()
+
+
+class MmapBackend:
+    """Open-addressing hash table in a shared memory-mapped file.
+
+    The file holds `slots` fixed-size slots; a key lives in one of the
+    PROBES slots after its hash. Each slot is a header (key hash,
+    expiry as wall-clock time, key and value lengths) followed by the key and
+    value bytes, so values larger than a slot aren't cached. A full probe
+    window evicts the entry closest to expiring. Every operation holds an
+    fcntl lock on the file (shared to read, exclusive to write), which is
+    what makes it safe across worker processes. The lock is taken without
+    blocking and retried with a sleep, so a worker holding it doesn't stall
+    this worker's event loop; after `timeout` the operation fails like a
+    network backend's would. The file is (re)opened per process, since
+    flock locks are shared by a descriptor inherited on fork.
+    """
+
+    HEADER = struct.Struct("<QdII")  # key hash, expires_at (0 = empty), key length, value length
+    PROBES = 8
+    LOCK_RETRY_SECONDS = 0.001
+
+    def __init__(self, path: str, slots: int, slot_size: int, timeout: float):
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.timeout = timeout
+        self.capacity = slot_size - self.HEADER.size
+        self._pid = None
+
+    async def _lock(self, fd: int, operation: int) -> None:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(fd, operation | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise asyncio.TimeoutError(f"{self.path} stayed locked for {self.timeout}s")
+                await asyncio.sleep(self.LOCK_RETRY_SECONDS)
+
+    async def _open(self) -> None:
+        size = self.slots * self.slot_size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            # First worker sizes the file; resizing a live table would scramble it
+            await self._lock(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_size != size:
+                    os.ftruncate(fd, size)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(fd)
+            raise
+        if self._pid == os.getpid():
+            # Another task of this process opened it meanwhile
+            os.close(fd)
+            return
+        self._fd = fd
+        self._map = mmap.mmap(fd, size)
+        self._pid = os.getpid()
+
+    def _hash(self, key: bytes) -> int:
+        # Never 0, so a zeroed slot is never mistaken for a match
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+    def _probe(self, key_hash: int):
+        start = key_hash % self.slots
+        for i in range(self.PROBES):
+            yield ((start + i) % self.slots) * self.slot_size
+
+    def _find(self, key: bytes, key_hash: int, now: float) -> Optional[int]:
+        for offset in self._probe(key_hash):
+            slot_hash, expires_at, key_length, _ = self.HEADER.unpack_from(self._map, offset)
+            if slot_hash != key_hash or expires_at <= now:
+                continue
+            start = offset + self.HEADER.size
+            if self._map[start:start + key_length] == key:
+                return offset
+        return None
+
+    def _read(self, offset: int) -> bytes:
+        _, _, key_length, value_length = self.HEADER.unpack_from(self._map, offset)
+        start = offset + self.HEADER.size + key_length
+        return self._map[start:start + value_length]
+
+    def _write(self, key: bytes, key_hash: int, value: bytes, expires_at: float, now: float) -> bool:
+        if len(key) + len(value) > self.capacity:
+            return False
+        offset = self._find(key, key_hash, now)
+        if offset is None:
+            # Oldest-expiring (empty and expired slots first) in the window
+            offset = min(self._probe(key_hash), key=lambda o: self.HEADER.unpack_from(self._map, o)[1])
+        self.HEADER.pack_into(self._map, offset, key_hash, expires_at, len(key), len(value))
+        start = offset + self.HEADER.size
+        self._map[start:start + len(key) + len(value)] = key + value
+        return True
+
+    async def _locked(self, exclusive: bool, fn, *args):
+        if self._pid != os.getpid():
+            await self._open()
+        await self._lock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        # No await until unlocked: other tasks of this process share the
+        # descriptor, so the flock doesn't keep them out, the event loop does
+        try:
+            return fn(*args)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        offset = self._find(key, self._hash(key), time.time())
+        return None if offset is None else self._read(offset)
+
+    def _set(self, key: bytes, value: bytes, ttl: Optional[float], only_if_missing: bool) -> bool:
+        now = time.time()
+        key_hash = self._hash(key)
+        if only_if_missing and self._find(key, key_hash, now) is not None:
+            return False
+        expires_at = float("inf") if ttl is None else now + ttl
+        return self._write(key, key_hash, value, expires_at, now)
+
+    def _delete(self, key: bytes) -> None:
+        offset = self._find(key, self._hash(key), time.time())
+        if offset is not None:
+            self.HEADER.pack_into(self._map, offset, 0, 0.0, 0, 0)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._locked(False, self._get, key.encode())
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None, only_if_missing: bool = False) -> bool:
+        return await self._locked(True, self._set, key.encode(), value, ttl, only_if_missing)
+
+    async def delete(self, key: str) -> None:
+        await self._locked(True, self._delete, key.encode())
+
+    async def close(self) -> None:
+        if self._pid == os.getpid():
+            self._map.close()
+            os.close(self._fd)
+            self._pid = None
+
+
+class RedisBackend:
+    """Minimal asyncio client for the Redis protocol (RESP2).
+
+    Only GET, SET (PX, NX) and DEL are used, so any server implementing
+    those works: Redis, Valkey, KeyDB, or a local fake in tests. Connections
+    are opened on demand and reused, up to `pool_size`.
+    """
+
+    def __init__(self, url: str, pool_size: int, timeout: float):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._idle: list = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = (reader, writer)
+        try:
+            if self.password:
+                await self._call(connection, "AUTH", self.password)
+            if self.db:
+                await self._call(connection, "SELECT", self.db)
+        except BaseException:
+            writer.close()
+            raise
+        return connection
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    @classmethod
+    async def _reply(cls, reader):
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise CacheError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = await reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(rest)
+            return None if count < 0 else [await cls._reply(reader) for _ in range(count)]
+        raise CacheError(f"unexpected reply {line!r}")
+
+    async def _call(self, connection, *args):
+        reader, writer = connection
+        writer.write(self._encode(args))
+        await writer.drain()
+        return await self._reply(reader)
+
+    async def execute(self, *args):
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                if connection is None:
+                    connection = await asyncio.wait_for(self._connect(), self.timeout)
+                result = await asyncio.wait_for(self._call(connection, *args), self.timeout)
+            except CacheError:
+                # A command error leaves the connection usable
+                if connection is not None:
+                    self._idle.append(connection)
+                raise
+            except BaseException:
+                # Anything else (timeout, reset) may leave a reply in flight
+                if connection is not None:
+                    connection[1].close()
+                raise
+            self._idle.append(connection)
+            return result
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None, only_if_missing: bool = False) -> bool:
+        args = ["SET", key, value]
+        if ttl is not None:
+            args += ["PX", max(1, int(ttl * 1000))]
+        if only_if_missing:
+            args.append("NX")
+        return await self.execute(*args) is not None
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", key)
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+            with suppress(OSError):
+                await writer.wait_closed()
+
+
+class CircuitBreaker:
+    """Wraps a backend so that, once it fails, callers stop waiting on it.
+
+    A connection error or timeout opens the breaker for `cooldown` seconds,
+    during which every operation raises CacheUnavailable at once: requests
+    go straight to their loaders instead of each spending the backend's
+    timeout (several times over: get, lock, set). After the cooldown one
+    operation is let through as a probe; its success closes the breaker,
+    its failure opens it again. Error replies (CacheError) mean the backend
+    is up and don't count.
+    """
+
+    def __init__(self, backend, cooldown: float):
+        self.backend = backend
+        self.cooldown = cooldown
+        self._open_until = 0.0
+
+    async def _call(self, operation, *args):
+        if self._open_until:
+            now = time.monotonic()
+            if now < self._open_until:
+                raise CacheUnavailable(f"cache unavailable, retrying in {self._open_until - now:.1f}s")
+            # This call is the probe; the rest keep failing fast meanwhile
+            self._open_until = now + self.cooldown
+        try:
+            result = await operation(*args)
+        except (OSError, EOFError, asyncio.TimeoutError) as e:
+            if not self._open_until:
+                logger.warning("Cache backend failed (%r); bypassing it for %ss", e, self.cooldown)
+            self._open_until = time.monotonic() + self.cooldown
+            raise
+        self._open_until = 0.0
+        return result
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._call(self.backend.get, key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None, only_if_missing: bool = False) -> bool:
+        return await self._call(self.backend.set, key, value, ttl, only_if_missing)
+
+    async def delete(self, key: str) -> None:
+        await self._call(self.backend.delete, key)
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+
+def create_backend():
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryBackend(maxsize=settings.CACHE_MEMORY_SIZE)
+    if settings.CACHE_BACKEND == "mmap":
+        backend = MmapBackend(
+            settings.CACHE_MMAP_PATH, settings.CACHE_MMAP_SLOTS, settings.CACHE_MMAP_SLOT_SIZE,
+            settings.CACHE_TIMEOUT_SECONDS
+        )
+    elif settings.CACHE_BACKEND == "redis":
+        backend = RedisBackend(settings.CACHE_URL, settings.CACHE_POOL_SIZE, settings.CACHE_TIMEOUT_SECONDS)
+    else:
+        raise ValueError(f"Unknown CACHE_BACKEND {settings.CACHE_BACKEND!r}")
+    return CircuitBreaker(backend, settings.CACHE_BREAKER_SECONDS)
+
+
+cache_backend = create_backend()
+
+
+class SharedCache:
+    """One namespace of the shared cache: keys are prefixed with `namespace`
+    and stored with the namespace's default `ttl`"""
+
+    def __init__(self, namespace: str, ttl: float, backend=None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.backend = backend or cache_backend
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def _safely(self, operation, *args, default=None):
+        try:
+            return await operation(*args)
+        except CacheUnavailable:
+            return default
+        except (OSError, EOFError, CacheError, asyncio.TimeoutError) as e:
+            logger.warning("Cache %s %s failed: %r", self.namespace, operation.__name__, e)
+            return default
+
+    async def version(self, group: str) -> str:
+        """Current version token of `group`"""
+        key = self._key(f"version:{group}")
+        value = await self._safely(self.backend.get, key)
+        if value is None:
+            # First use (or evicted): start a version, unless another worker just did
+            await self._safely(self.backend.set, key, secrets.token_hex(8).encode(), VERSION_TTL_SECONDS, True)
+            value = await self._safely(self.backend.get, key)
+        # Backend down: a version no entry is stored under, so a guaranteed miss
+        return value.decode() if value is not None else secrets.token_hex(8)
+
+    async def bump(self, group: str) -> None:
+        """Invalidate every key stored under `group`"""
+        # Concurrent bumps may overwrite each other; either way the old version is gone
+        await self._safely(
+            self.backend.set, self._key(f"version:{group}"), secrets.token_hex(8).encode(), VERSION_TTL_SECONDS
+        )
+
+    async def _full_key(self, key: str, group: Optional[str]) -> str:
+        if group is None:
+            return self._key(key)
+        return self._key(f"{key}@{await self.version(group)}")
+
+    async def get(self, key: str, group: Optional[str] = None, default: Any = None) -> Any:
+        data = await self._safely(self.backend.get, await self._full_key(key, group))
+        return default if data is None else pickle.loads(data)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, group: Optional[str] = None) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        await self._safely(self.backend.set, await self._full_key(key, group), data, self.ttl if ttl is None else ttl)
+
+    async def delete(self, key: str) -> None:
+        await self._safely(self.backend.delete, self._key(key))
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        group: Optional[str] = None,
+        cache_none: bool = False
+    ) -> Any:
+        """Cached value of `key`, or `await loader()` stored for next time.
+
+        The load runs in a task of its own, shared by every caller missing
+        the same key, and outlives a caller that is cancelled. So `loader`
+        must not use the caller's session or anything else scoped to its
+        request: open a session inside it.
+
+        None results are only stored with `cache_none`: a row that doesn't
+        exist yet (say, not replicated yet) shouldn't stay missing for a TTL.
+        """
+        full_key = await self._full_key(key, group)
+        value = await self._load_cached(full_key)
+        if value is not _MISSING:
+            return value
+
+        # Concurrent misses in this worker share one load
+        pending = self._in_flight.get(full_key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this caller was cancelled
+            except Exception:
+                pass
+            # The shared load failed: a miss here, not its error
+            return await self._start_load(full_key, loader, ttl, cache_none, shared=False)
+        return await self._start_load(full_key, loader, ttl, cache_none, shared=True)
+
+    async def _start_load(self, full_key: str, loader, ttl: Optional[float], cache_none: bool, shared: bool) -> Any:
+        task = asyncio.get_running_loop().create_task(self._load_once(full_key, loader, ttl, cache_none))
+
+        def done(task):
+            if self._in_flight.get(full_key) is task:
+                del self._in_flight[full_key]
+            if not task.cancelled():
+                # Its callers may all be gone; don't warn about an unretrieved exception
+                task.exception()
+
+        if shared:
+            self._in_flight[full_key] = task
+        task.add_done_callback(done)
+        # A cancelled caller leaves the load running for the others
+        return await asyncio.shield(task)
+
+    async def _load_cached(self, full_key: str) -> Any:
+        data = await self._safely(self.backend.get, full_key)
+        return _MISSING if data is None else pickle.loads(data)
+
+    async def _load_once(self, full_key: str, loader, ttl: Optional[float], cache_none: bool) -> Any:
+        # Across workers: whoever takes the lock loads; the others poll for
+        # its result and only load themselves if it doesn't show up in time
+        lock_key = f"{full_key}:loading"
+        locked = await self._safely(self.backend.set, lock_key, b"1", LOAD_LOCK_SECONDS, True, default=True)
+        if not locked:
+            deadline = time.monotonic() + LOAD_LOCK_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(LOAD_POLL_SECONDS)
+                value = await self._load_cached(full_key)
+                if value is not _MISSING:
+                    return value
+
+        try:
+            value = await loader()
+            if value is not None or cache_none:
+                data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                await self._safely(self.backend.set, full_key, data, self.ttl if ttl is None else ttl)
+            return value
+        finally:
+            if locked:
+                await self._safely(self.backend.delete, lock_key)
+
+
+async def close_cache_backend() -> None:
+    await cache_backend.close()
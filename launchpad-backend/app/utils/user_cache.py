@@ -0,0 +1,108 @@
+"""Cache of authenticated users, keyed by user id, in the shared cache.
+
+Entries are a user's column values; `get_user` hands them out as detached
+`User` instances, so treat them as read-only. Any ORM update or delete of a
+user row bumps that user's version once the transaction commits, which
+invalidates the entry for every worker (see app.utils.shared_cache). Bulk
+`query(User).update()` calls bypass the ORM events and must call
+`invalidate_user` themselves.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import get_settings
+from app.database import AsyncReadSessionLocal, is_pinned, pin_to_primary, pin_user_to_primary
+from app.models.user import User
+from app.utils.shared_cache import SharedCache
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+user_cache = SharedCache("user", ttl=settings.USER_CACHE_TTL_SECONDS)
+
+# Invalidations scheduled from (sync) commit hooks; referenced until done
+_pending = set()
+
+
+def _to_row(user: User) -> dict:
+    return {column.key: getattr(user, column.key) for column in User.__table__.columns}
+
+
+def _from_row(row: dict) -> User:
+    user = User(**row)
+    make_transient_to_detached(user)
+    return user
+
+
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """The user with `user_id`, from the cache or else the database.
+
+    A miss loads in a session of its own (see SharedCache.get_or_load),
+    from the primary if `db` is pinned to it.
+    """
+    primary = is_pinned(db)
+
+    async def load():
+        async with AsyncReadSessionLocal() as session:
+            if primary:
+                pin_to_primary(session)
+            user = await session.get(User, user_id)
+            if not user and not is_pinned(session):
+                # Just registered: the replica may not have the row yet
+                pin_to_primary(session)
+                user = await session.get(User, user_id)
+            return _to_row(user) if user else None
+
+    row = await user_cache.get_or_load(str(user_id), load, group=str(user_id))
+    return _from_row(row) if row else None
+
+
+async def user_exists(user_id: int) -> bool:
+    """Whether the user is still there, for code without a session of its own"""
+    async with AsyncReadSessionLocal() as db:
+        return await get_user(db, user_id) is not None
+
+
+async def invalidate_user(user_id: int) -> None:
+    await user_cache.bump(str(user_id))
+
+
+async def _user_changed(user_id: int) -> None:
+    # Pinned first, so the reload that follows the bump reads the primary
+    await pin_user_to_primary(user_id)
+    await invalidate_user(user_id)
+
+
+def _record_change(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+event.listen(User, "after_update", _record_change)
+event.listen(User, "after_delete", _record_change)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    # Only after commit: invalidating earlier would let a concurrent request
+    # cache the old row again under the new version
+    user_ids = session.info.pop("changed_user_ids", ())
+    if not user_ids:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Sync scripts: entries expire after USER_CACHE_TTL_SECONDS instead
+        logger.info("No event loop to invalidate cached users %s", sorted(user_ids))
+        return
+    for user_id in user_ids:
+        task = loop.create_task(_user_changed(user_id))
+        _pending.add(task)
+        task.add_done_callback(_pending.discard)
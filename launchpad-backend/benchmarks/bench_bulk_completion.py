@@ -0,0 +1,78 @@
+"""Benchmark: N single PATCH /tasks/{id}/completion calls vs one
+PATCH /tasks/completion batch.
+
+    python benchmarks/bench_bulk_completion.py [--base-url http://localhost:8000/api/v1] [--rounds 20]
+
+Runs against a live API (uvicorn app.main:app) with a seeded catalog.
+Registers a throwaway user on first use. Needs benchmarks/requirements.txt.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+async def get_token(client):
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    response = await client.post("/auth/register", json={"email": email, "password": "benchmark-password"})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def get_task_ids(client):
+    modules = (await client.get("/modules")).json()
+    task_ids = []
+    for module in modules:
+        detail = (await client.get(f"/modules/{module['slug']}")).json()
+        task_ids.extend(task["id"] for task in detail["tasks"])
+    return task_ids
+
+
+async def singles(client, task_ids, completed):
+    for task_id in task_ids:
+        response = await client.patch(f"/tasks/{task_id}/completion", json={"completed": completed})
+        response.raise_for_status()
+
+
+async def batch(client, task_ids, completed):
+    items = [{"task_id": task_id, "completed": completed} for task_id in task_ids]
+    response = await client.patch("/tasks/completion", json={"items": items})
+    response.raise_for_status()
+
+
+async def measure(fn, client, task_ids, rounds):
+    timings = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        await fn(client, task_ids, i % 2 == 0)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        client.headers["Authorization"] = f"Bearer {await get_token(client)}"
+        task_ids = await get_task_ids(client)
+
+        single_timings = await measure(singles, client, task_ids, args.rounds)
+        batch_timings = await measure(batch, client, task_ids, args.rounds)
+
+    single_ms = statistics.median(single_timings) * 1000
+    batch_ms = statistics.median(batch_timings) * 1000
+
+    print(f"\nToggling {len(task_ids)} tasks, median of {args.rounds} rounds\n")
+    print(f"{'N single calls':<18}{single_ms:>10.1f}ms")
+    print(f"{'one batch call':<18}{batch_ms:>10.1f}ms")
+    print(f"{'speedup':<18}{single_ms / batch_ms:>11.1f}x\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
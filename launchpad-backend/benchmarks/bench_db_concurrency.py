@@ -0,0 +1,105 @@
+"""Concurrency benchmark: sync Session vs AsyncSession under concurrent load.
+
+    python benchmarks/bench_db_concurrency.py [--requests 500] [--concurrency 50] [--query-ms 5]
+
+Each simulated request runs one query that takes --query-ms on the server
+(pg_sleep), the way a handler waits on Postgres. Three paths are compared:
+
+  sync-on-loop   sync Session called from an `async def` handler (the old
+                 behaviour: every query blocks the event loop)
+  sync-threadpool  sync Session via run_in_threadpool (plain `def` handlers)
+  async          AsyncSession from app.database
+
+Requires DATABASE_URL to point at a running Postgres.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from app.database import AsyncSessionLocal, SessionLocal, async_engine, engine
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def sync_query(seconds):
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT pg_sleep(:s)"), {"s": seconds})
+    finally:
+        db.close()
+
+
+async def sync_on_loop(seconds):
+    sync_query(seconds)
+
+
+async def sync_threadpool(seconds):
+    await run_in_threadpool(sync_query, seconds)
+
+
+async def async_session(seconds):
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SELECT pg_sleep(:s)"), {"s": seconds})
+
+
+async def run(path, requests, concurrency, seconds):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await path(seconds)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--query-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    seconds = args.query_ms / 1000
+    paths = {
+        "sync-on-loop": sync_on_loop,
+        "sync-threadpool": sync_threadpool,
+        "async": async_session,
+    }
+
+    print(f"\n{args.requests} requests, concurrency {args.concurrency}, {args.query_ms}ms per query\n")
+    print(f"{'path':<18}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, path in paths.items():
+        # Warm the pools so connection setup isn't measured
+        await run(path, 20, 10, 0)
+        throughput, latencies = await run(path, args.requests, args.concurrency, seconds)
+        print(
+            f"{name:<18}{throughput:>10.0f}"
+            f"{statistics.median(latencies) * 1000:>10.1f}"
+            f"{percentile(latencies, 99) * 1000:>10.1f}"
+        )
+    print()
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
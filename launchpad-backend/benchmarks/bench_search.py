@@ -0,0 +1,96 @@
+"""Microbenchmark: build time and query latency of the catalog search index.
+
+    python benchmarks/bench_search.py [--tasks 5000] [--guides 500] [--guide-words 1500]
+        [--queries 5000] [--target-p99-ms 5]
+
+Indexes a synthetic catalog (random words from a fixed vocabulary, seeded)
+and runs a mix of one- and two-word queries, the last word often a prefix,
+the way a search box sends them. Exits non-zero if p99 misses the target.
+No database needed.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.utils.search import SearchDocument, SearchIndex
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def make_vocabulary(rng, size):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def words(rng, vocabulary, count):
+    # Zipf-ish: a few words are very common, most are rare
+    return " ".join(vocabulary[min(int(rng.paretovariate(1.0)) - 1, len(vocabulary) - 1)] for _ in range(count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--guides", type=int, default=500)
+    parser.add_argument("--guide-words", type=int, default=1500)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--target-p99-ms", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, args.vocabulary)
+    rng.shuffle(vocabulary)
+
+    documents = [
+        SearchDocument("task", i, {"title": words(rng, vocabulary, 4), "description": words(rng, vocabulary, 12)})
+        for i in range(args.tasks)
+    ] + [
+        SearchDocument("guide", i, {
+            "title": words(rng, vocabulary, 5),
+            "subtitle": words(rng, vocabulary, 8),
+            "content": words(rng, vocabulary, args.guide_words),
+        })
+        for i in range(args.guides)
+    ]
+
+    start = time.perf_counter()
+    index = SearchIndex(documents)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    queries = []
+    for _ in range(args.queries):
+        terms = [vocabulary[min(int(rng.paretovariate(0.7)) - 1, 2000)] for _ in range(rng.choice((1, 2)))]
+        if rng.random() < 0.5:
+            terms[-1] = terms[-1][:rng.randint(2, max(2, len(terms[-1])))]
+        queries.append(" ".join(terms))
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit=20)
+        latencies.append(time.perf_counter() - start)
+
+    p99 = percentile(latencies, 99) * 1000
+    print(f"\n{len(index)} documents indexed in {build_ms:.0f}ms")
+    print(f"{args.queries} queries: p50 {statistics.median(latencies) * 1000:.3f}ms  "
+          f"p95 {percentile(latencies, 95) * 1000:.3f}ms  p99 {p99:.3f}ms  "
+          f"({args.queries / sum(latencies):.0f} queries/s per core)\n")
+
+    if p99 > args.target_p99_ms:
+        print(f"❌ p99 {p99:.2f}ms over the {args.target_p99_ms}ms target\n")
+        sys.exit(1)
+    print(f"✅ p99 within the {args.target_p99_ms}ms target\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""Load test: fixed-concurrency runs against the main API endpoints.
+
+    python benchmarks/load_test.py [--base-url http://localhost:8000/api/v1] [--concurrency 50]
+        [--duration 30] [--scenarios login,modules,module_detail,progress,dashboard,toggle]
+        [--output results.json] [--compare previous.json]
+
+Expects a running API (uvicorn app.main:app) over a database seeded with
+scripts/seed_database.py and benchmarks/seed_synthetic.py. Each scenario runs
+for --duration seconds with --concurrency clients issuing requests back to
+back, as random synthetic users. Per scenario it reports throughput and
+p50/p95/p99 latency, writes everything to --output as JSON, and with
+--compare prints the change against an earlier run's JSON.
+
+Needs benchmarks/requirements.txt.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+EMAIL_TEMPLATE = "loadtest-{}@example.com"
+DEFAULT_PASSWORD = "loadtest-password"
+SCENARIOS = ("login", "modules", "module_detail", "progress", "dashboard", "toggle")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Context:
+    """Tokens and catalog ids gathered before the measured runs"""
+
+    def __init__(self, args, tokens, slugs, task_ids):
+        self.args = args
+        self.tokens = tokens
+        self.slugs = slugs
+        self.task_ids = task_ids
+
+    def auth(self, rng):
+        return {"Authorization": f"Bearer {rng.choice(self.tokens)}"}
+
+
+async def login(client, ctx, rng):
+    email = EMAIL_TEMPLATE.format(rng.randrange(ctx.args.population))
+    return await client.post("/auth/login", json={"email": email, "password": ctx.args.password})
+
+
+async def modules(client, ctx, rng):
+    return await client.get("/modules", headers=ctx.auth(rng))
+
+
+async def module_detail(client, ctx, rng):
+    return await client.get(f"/modules/{rng.choice(ctx.slugs)}", headers=ctx.auth(rng))
+
+
+async def progress(client, ctx, rng):
+    return await client.get("/progress", headers=ctx.auth(rng))
+
+
+async def dashboard(client, ctx, rng):
+    return await client.get("/dashboard", headers=ctx.auth(rng))
+
+
+async def toggle(client, ctx, rng):
+    return await client.patch(
+        f"/tasks/{rng.choice(ctx.task_ids)}/completion",
+        headers=ctx.auth(rng),
+        json={"completed": rng.random() < 0.5}
+    )
+
+
+REQUESTS = {
+    "login": login,
+    "modules": modules,
+    "module_detail": module_detail,
+    "progress": progress,
+    "dashboard": dashboard,
+    "toggle": toggle,
+}
+
+
+async def prepare(client, args):
+    """Log in --users synthetic users and read the catalog's slugs and task ids"""
+    semaphore = asyncio.Semaphore(4)  # stay under the password hashing queue limit
+
+    async def get_token(n):
+        async with semaphore:
+            response = await client.post(
+                "/auth/login",
+                json={"email": EMAIL_TEMPLATE.format(n), "password": args.password}
+            )
+            response.raise_for_status()
+            return response.json()["access_token"]
+
+    tokens = await asyncio.gather(*(get_token(n) for n in range(min(args.users, args.population))))
+    headers = {"Authorization": f"Bearer {tokens[0]}"}
+
+    response = await client.get("/modules", headers=headers)
+    response.raise_for_status()
+    slugs = [module["slug"] for module in response.json()]
+
+    task_ids = []
+    for slug in slugs:
+        response = await client.get(f"/modules/{slug}", headers=headers)
+        response.raise_for_status()
+        task_ids.extend(task["id"] for task in response.json()["tasks"])
+
+    return Context(args, list(tokens), slugs, task_ids)
+
+
+async def run_scenario(client, ctx, name, concurrency, duration, seed):
+    request = REQUESTS[name]
+    latencies = []
+    statuses = {}
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id):
+        nonlocal errors
+        rng = random.Random(f"{seed}-{name}-{worker_id}")
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await request(client, ctx, rng)
+                status = str(response.status_code)
+            except httpx.HTTPError:
+                status = "error"
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == "error" or int(status) >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def print_results(results, previous=None):
+    print(f"\n{'scenario':<15}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, result in results["scenarios"].items():
+        print(
+            f"{name:<15}{result['throughput_rps']:>10.1f}{result['p50_ms'] or 0:>10.1f}"
+            f"{result['p95_ms'] or 0:>10.1f}{result['p99_ms'] or 0:>10.1f}{result['errors']:>8}"
+        )
+
+    if previous:
+        print(f"\nchange vs {previous['meta'].get('commit') or 'previous run'}:")
+        print(f"{'scenario':<15}{'req/s':>10}{'p50':>10}{'p99':>10}")
+        for name, result in results["scenarios"].items():
+            before = previous["scenarios"].get(name)
+            if not before:
+                continue
+            changes = []
+            for key in ("throughput_rps", "p50_ms", "p99_ms"):
+                if before.get(key) and result.get(key) is not None:
+                    changes.append(f"{(result[key] - before[key]) / before[key] * 100:+.1f}%")
+                else:
+                    changes.append("n/a")
+            print(f"{name:<15}{changes[0]:>10}{changes[1]:>10}{changes[2]:>10}")
+    print()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds per scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--users", type=int, default=200, help="synthetic users to hold tokens for")
+    parser.add_argument("--population", type=int, default=100_000, help="users seeded by seed_synthetic.py")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="JSON results file (default: timestamped)")
+    parser.add_argument("--compare", default=None, help="earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    started_at = datetime.now(timezone.utc)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30.0) as client:
+        print(f"🔑 Logging in {args.users} synthetic users...")
+        ctx = await prepare(client, args)
+
+        results = {
+            "meta": {
+                "started_at": started_at.isoformat(),
+                "commit": git_commit(),
+                "base_url": args.base_url,
+                "concurrency": args.concurrency,
+                "duration": args.duration,
+                "users": len(ctx.tokens),
+                "population": args.population,
+                "seed": args.seed,
+                "python": platform.python_version(),
+            },
+            "scenarios": {},
+        }
+
+        for name in scenarios:
+            print(f"🚀 {name}: {args.concurrency} clients for {args.duration:g}s")
+            if args.warmup:
+                await run_scenario(client, ctx, name, args.concurrency, args.warmup, args.seed)
+            results["scenarios"][name] = await run_scenario(
+                client, ctx, name, args.concurrency, args.duration, args.seed
+            )
+
+    output = args.output or f"loadtest-{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+
+    print_results(results, previous)
+    print(f"✅ Results written to {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
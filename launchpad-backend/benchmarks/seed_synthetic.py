@@ -0,0 +1,167 @@
+"""Seed a synthetic user population for load tests.
+
+    python benchmarks/seed_synthetic.py [--users 100000] [--completion 0.4] [--seed 42] [--reset]
+
+Runs on top of the catalog from scripts/seed_database.py. Users get the
+emails loadtest-<n>@example.com (n from 0) and all share --password, so
+benchmarks/load_test.py can log in as any of them. The password is hashed
+once and that hash reused for every row; users, progress rows and
+completion bitmaps are written with COPY, one transaction per --chunk users.
+The same --seed always produces the same population.
+
+Requires DATABASE_URL to point at a migrated Postgres.
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import engine
+from app.utils.auth import get_password_hash
+from app.utils.progress import int_to_bitmap
+
+EMAIL_TEMPLATE = "loadtest-{}@example.com"
+EMAIL_PATTERN = "loadtest-%@example.com"
+DEFAULT_PASSWORD = "loadtest-password"
+
+CHALLENGES = ("money", "housing", "taxes", "all")
+LIFE_STAGES = ("college", "graduated", "first_job", "working")
+
+
+def copy_rows(cursor, table, columns, rows):
+    """COPY `rows` (tuples of already-escaped text values) into `table`"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def generate_chunk(rng, start, count, password_hash, task_ids, completion, now):
+    users = []
+    progress_by_index = []
+    for n in range(start, start + count):
+        users.append((
+            str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            EMAIL_TEMPLATE.format(n),
+            password_hash,
+            f"Load Test {n}",
+            "t",
+            rng.choice(CHALLENGES),
+            rng.choice(LIFE_STAGES),
+        ))
+
+        # Each task was touched with probability `completion`; most touched
+        # tasks are still completed, the rest were toggled back
+        progress = []
+        for task_id in task_ids:
+            if rng.random() < completion:
+                completed = rng.random() < 0.9
+                completed_at = now - timedelta(minutes=rng.randrange(60 * 24 * 90))
+                progress.append((task_id, completed, completed_at if completed else None))
+        progress_by_index.append(progress)
+    return users, progress_by_index
+
+
+def seed(users, completion, password, rng_seed, chunk, reset):
+    rng = random.Random(rng_seed)
+    password_hash = get_password_hash(password)
+    now = datetime.now(timezone.utc)
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("SELECT id FROM tasks ORDER BY id")
+        task_ids = [row[0] for row in cursor.fetchall()]
+        if not task_ids:
+            print("❌ No tasks found, run scripts/seed_database.py first")
+            sys.exit(1)
+
+        cursor.execute("SELECT count(*) FROM users WHERE email LIKE %s", (EMAIL_PATTERN,))
+        existing = cursor.fetchone()[0]
+        if existing and not reset:
+            print(f"❌ {existing} synthetic users already exist, pass --reset to replace them")
+            sys.exit(1)
+        if existing:
+            print(f"🗑️  Removing {existing} synthetic users...")
+            cursor.execute("DELETE FROM users WHERE email LIKE %s", (EMAIL_PATTERN,))
+            raw.commit()
+
+        print(f"🌱 Seeding {users} users over {len(task_ids)} tasks...")
+        started = time.perf_counter()
+        progress_rows = 0
+
+        for start in range(0, users, chunk):
+            count = min(chunk, users - start)
+            user_rows, progress_by_index = generate_chunk(
+                rng, start, count, password_hash, task_ids, completion, now
+            )
+            copy_rows(
+                cursor, "users",
+                ("uuid", "email", "password_hash", "name", "onboarding_completed", "biggest_challenge", "life_stage"),
+                user_rows
+            )
+
+            emails = [row[1] for row in user_rows]
+            cursor.execute("SELECT email, id FROM users WHERE email = ANY(%s)", (emails,))
+            ids_by_email = dict(cursor.fetchall())
+
+            progress = []
+            bitmaps = []
+            for email, user_progress in zip(emails, progress_by_index):
+                user_id = ids_by_email[email]
+                bits = 0
+                for task_id, completed, completed_at in user_progress:
+                    progress.append((
+                        str(user_id),
+                        str(task_id),
+                        "t" if completed else "f",
+                        completed_at.isoformat() if completed_at else "\\N",
+                    ))
+                    if completed:
+                        bits |= 1 << task_id
+                # COPY text format: the bytea hex prefix \x needs its backslash escaped
+                bitmaps.append((str(user_id), "\\\\x" + int_to_bitmap(bits).hex()))
+
+            copy_rows(cursor, "user_task_progress", ("user_id", "task_id", "completed", "completed_at"), progress)
+            copy_rows(cursor, "user_completion_bitmaps", ("user_id", "bitmap"), bitmaps)
+            raw.commit()
+
+            progress_rows += len(progress)
+            print(f"  ✅ {start + count}/{users} users, {progress_rows} progress rows")
+
+        cursor.execute("ANALYZE users")
+        cursor.execute("ANALYZE user_task_progress")
+        cursor.execute("ANALYZE user_completion_bitmaps")
+        raw.commit()
+    finally:
+        raw.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Seeded {users} users and {progress_rows} progress rows in {elapsed:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--completion", type=float, default=0.4,
+                        help="probability that a user has a progress row for a task")
+    parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk", type=int, default=10_000)
+    parser.add_argument("--reset", action="store_true", help="delete existing synthetic users first")
+    args = parser.parse_args()
+
+    seed(args.users, args.completion, args.password, args.seed, args.chunk, args.reset)
+
+
+if __name__ == "__main__":
+    main()
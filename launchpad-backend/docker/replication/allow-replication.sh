@@ -0,0 +1,10 @@
+#!/bin/sh
+# Lets the db-replica service stream WAL from this server (runs once, when
+# the primary's data volume is first initialised).
+#
+# For an existing volume, apply it by hand:
+#   docker compose exec db sh /docker-entrypoint-initdb.d/allow-replication.sh
+#   docker compose exec db psql -U postgres -c "SELECT pg_reload_conf()"
+set -e
+grep -q "^host replication all all" "$PGDATA/pg_hba.conf" \
+    || echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
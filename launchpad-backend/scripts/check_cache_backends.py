@@ -0,0 +1,262 @@
+import sys
+import os
+import asyncio
+import fcntl
+import socket
+import tempfile
+import time
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.utils.shared_cache import CircuitBreaker, MemoryBackend, MmapBackend, RedisBackend, SharedCache
+
+
+# Runs the same checks against every shared cache backend. Redis is checked
+# against CHECK_REDIS_URL if given, e.g.
+#   CHECK_REDIS_URL=redis://localhost:6379/0 python scripts/check_cache_backends.py
+# and otherwise against a small in-process server speaking the same protocol.
+
+
+async def serve_fake_redis():
+    """GET, SET (PX, NX) and DEL over RESP2, with expiry; enough for RedisBackend"""
+    store = {}
+    loop = asyncio.get_running_loop()
+
+    def live(key):
+        entry = store.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= loop.time():
+            del store[key]
+            return None
+        return entry
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                args = []
+                for _ in range(int(header[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                command = args[0].upper()
+                if command == b"GET":
+                    entry = live(args[1])
+                    reply = b"$-1\r\n" if entry is None else b"$%d\r\n%s\r\n" % (len(entry[0]), entry[0])
+                elif command == b"SET":
+                    options = [arg.upper() for arg in args[3:]]
+                    expires_at = None
+                    if b"PX" in options:
+                        expires_at = loop.time() + int(args[3 + options.index(b"PX") + 1]) / 1000
+                    if b"NX" in options and live(args[1]) is not None:
+                        reply = b"$-1\r\n"
+                    else:
+                        store[args[1]] = (args[2], expires_at)
+                        reply = b"+OK\r\n"
+                elif command == b"DEL":
+                    reply = b":%d\r\n" % (store.pop(args[1], None) is not None)
+                else:
+                    reply = b"-ERR unknown command\r\n"
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            # Server shutting down, or the client went away
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def run_checks(backend):
+    results = []
+
+    def check(description, ok):
+        results.append((description, ok))
+
+    cache = SharedCache("check", ttl=0.2, backend=backend)
+
+    await cache.set("plain", {"a": 1})
+    check("set then get", await cache.get("plain") == {"a": 1})
+    await asyncio.sleep(0.3)
+    check("entries expire after the TTL", await cache.get("plain") is None)
+
+    await cache.set("row", "old", ttl=10, group="g")
+    check("versioned get", await cache.get("row", group="g") == "old")
+    await cache.bump("g")
+    check("bump invalidates the group", await cache.get("row", group="g") is None)
+
+    loads = 0
+
+    async def load():
+        nonlocal loads
+        loads += 1
+        await asyncio.sleep(0.05)
+        return "loaded"
+
+    values = await asyncio.gather(*(cache.get_or_load("single", load, ttl=10) for _ in range(20)))
+    check("concurrent misses load once", loads == 1 and set(values) == {"loaded"})
+    await cache.get_or_load("single", load, ttl=10)
+    check("later calls hit the cache", loads == 1)
+
+    # A second cache object sharing the backend stands in for another worker
+    other = SharedCache("check", ttl=0.2, backend=backend)
+    loads = 0
+    await asyncio.gather(cache.get_or_load("shared", load, ttl=10), other.get_or_load("shared", load, ttl=10))
+    check("misses in two workers load once", loads == 1)
+
+    async def missing():
+        return None
+
+    await cache.get_or_load("missing", missing)
+    check("None is not cached by default", await cache.get("missing", default="unset") == "unset")
+
+    await cache.delete("single")
+    check("delete", await cache.get("single") is None)
+
+    # The first caller is cancelled (client went away) mid-load
+    loads = 0
+    first = asyncio.ensure_future(cache.get_or_load("cancelled", load, ttl=10))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.ensure_future(cache.get_or_load("cancelled", load, ttl=10))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    check("a cancelled caller doesn't fail the others", await waiter == "loaded" and loads == 1)
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("database down")
+
+    async def waiter_load():
+        await asyncio.sleep(0.06)  # joins the failing load first
+        return await cache.get_or_load("failed", load, ttl=10)
+
+    loads = 0
+    outcomes = await asyncio.gather(cache.get_or_load("failed", fail, ttl=10), waiter_load(), return_exceptions=True)
+    check(
+        "a failed load is a miss for the others",
+        isinstance(outcomes[0], RuntimeError) and outcomes[1] == "loaded" and loads == 1
+    )
+    return results
+
+
+async def check_breaker():
+    """A dead server costs one timeout, then nothing until the cooldown ends"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()  # accepts connections but never replies
+        host, port = sock.getsockname()
+        backend = CircuitBreaker(RedisBackend(f"redis://{host}:{port}/0", pool_size=4, timeout=0.2), cooldown=0.5)
+        cache = SharedCache("check", ttl=10, backend=backend)
+
+        async def load():
+            return "loaded"
+
+        started = time.monotonic()
+        first = await cache.get_or_load("key", load, group="g")
+        first_seconds = time.monotonic() - started
+        started = time.monotonic()
+        second = await cache.get_or_load("key", load, group="g")
+        second_seconds = time.monotonic() - started
+        await asyncio.sleep(0.6)
+        started = time.monotonic()
+        await cache.get("key")
+        probe_seconds = time.monotonic() - started
+        await backend.close()
+
+    return [
+        ("dead server still serves loaded values", first == second == "loaded"),
+        (f"first request waits one timeout ({first_seconds:.2f}s)", first_seconds < 0.35),
+        (f"later requests skip the cache ({second_seconds * 1000:.1f}ms)", second_seconds < 0.01),
+        (f"after the cooldown the server is retried ({probe_seconds:.2f}s)", probe_seconds >= 0.2),
+    ]
+
+
+async def check_mmap_lock(path):
+    """A lock held by another process delays the operation, not the event loop"""
+    backend = MmapBackend(path, slots=1024, slot_size=512, timeout=0.2)
+    await backend.set("key", b"value")
+    other = os.open(path, os.O_RDWR)  # a second descriptor locks like another process
+    fcntl.flock(other, fcntl.LOCK_EX)
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.ensure_future(tick())
+    get = asyncio.ensure_future(backend.get("key"))
+    await asyncio.sleep(0.1)
+    fcntl.flock(other, fcntl.LOCK_UN)
+    value = await get
+
+    fcntl.flock(other, fcntl.LOCK_EX)
+    try:
+        await backend.get("key")
+        timed_out = False
+    except asyncio.TimeoutError:
+        timed_out = True
+    fcntl.flock(other, fcntl.LOCK_UN)
+    ticker.cancel()
+    os.close(other)
+    await backend.close()
+
+    return [
+        ("waits for the lock, then reads", value == b"value"),
+        (f"event loop kept running meanwhile ({ticks} ticks)", ticks >= 5),
+        ("gives up after the timeout", timed_out),
+    ]
+
+
+async def main():
+    backends = [("memory", MemoryBackend(maxsize=1000))]
+
+    directory = tempfile.TemporaryDirectory()
+    backends.append(("mmap", MmapBackend(os.path.join(directory.name, "cache"), slots=1024, slot_size=512, timeout=1.0)))
+
+    server = None
+    redis_url = os.getenv("CHECK_REDIS_URL")
+    if redis_url is None:
+        server = await serve_fake_redis()
+        host, port = server.sockets[0].getsockname()[:2]
+        redis_url = f"redis://{host}:{port}/0"
+        print(f"\nℹ️  CHECK_REDIS_URL not set, using a fake server at {redis_url}")
+    backends.append(("redis", RedisBackend(redis_url, pool_size=4, timeout=1.0)))
+
+    print("\n🗄️  Checking shared cache backends...\n")
+    failed = False
+    for name, backend in backends:
+        try:
+            results = await run_checks(backend)
+        finally:
+            await backend.close()
+        for description, ok in results:
+            failed = failed or not ok
+            print(f"  {'✅' if ok else '❌'} {name}: {description}")
+
+    extra = [
+        ("breaker", await check_breaker()),
+        ("mmap lock", await check_mmap_lock(os.path.join(directory.name, "locked"))),
+    ]
+    for name, results in extra:
+        for description, ok in results:
+            failed = failed or not ok
+            print(f"  {'✅' if ok else '❌'} {name}: {description}")
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    directory.cleanup()
+
+    if failed:
+        print("\n❌ Cache backend check failed\n")
+        sys.exit(1)
+    print("\n✅ All backends behave the same\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+import sys
+import os
+import asyncio
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from fastapi import Request, Response
+
+from app.database import AsyncSessionLocal, async_engine, count_queries
+from app.models.user import User
+from app.routers.dashboard import get_dashboard
+from app.routers.modules import get_all_modules, get_module_detail
+from app.routers.progress import get_user_progress
+from app.utils.catalog import refresh_catalog
+
+
+# Maximum number of SQL statements each handler may run, independent of
+# how many modules, tasks or progress rows exist. Raise these only on purpose.
+QUERY_BUDGETS = {
+    "GET /modules": 1,
+    # progress version (for the ETag), then the module's progress rows
+    "GET /modules/{slug}": 2,
+    "GET /progress": 1,
+    "GET /dashboard": 1,
+}
+
+
+async def count(handler, **kwargs):
+    # Unconditional request: no If-None-Match, so the full body is built
+    request = Request({"type": "http", "method": "GET", "headers": []})
+    with count_queries() as counter:
+        await handler(request=request, response=Response(), **kwargs)
+    return counter["count"]
+
+
+async def run_checks():
+    async with AsyncSessionLocal() as db:
+        # Throwaway user, rolled back at the end
+        user = User(email="query-count-check@example.com", password_hash="x")
+        db.add(user)
+        await db.flush()
+        
+        # Catalog reads are served from memory once loaded
+        catalog = await refresh_catalog(db)
+        if not catalog.modules:
+            print("❌ Catalog is empty, run scripts/seed_database.py first")
+            sys.exit(1)
+        slug = catalog.modules[0].slug
+        
+        counts = {
+            "GET /modules": await count(get_all_modules, current_user_id=user.id, db=db),
+            "GET /modules/{slug}": await count(get_module_detail, slug=slug, current_user_id=user.id, db=db),
+            "GET /progress": await count(get_user_progress, current_user=user, db=db),
+            "GET /dashboard": await count(get_dashboard, current_user=user, db=db),
+        }
+        
+        await db.rollback()
+    
+    await async_engine.dispose()
+    return counts
+
+
+def main():
+    print("\n🔎 Checking per-endpoint query counts...\n")
+    
+    counts = asyncio.run(run_checks())
+    
+    failures = []
+    for name, query_count in counts.items():
+        budget = QUERY_BUDGETS[name]
+        if query_count > budget:
+            failures.append(name)
+            print(f"  ❌ {name}: {query_count} queries (budget {budget})")
+        else:
+            print(f"  ✅ {name}: {query_count} queries (budget {budget})")
+    
+    if failures:
+        print(f"\n❌ {len(failures)} endpoint(s) over their query budget\n")
+        sys.exit(1)
+    
+    print("\n✅ All endpoints within their query budget\n")
+
+
+if __name__ == "__main__":
+    main()
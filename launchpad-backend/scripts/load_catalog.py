@@ -0,0 +1,266 @@
+"""Load the module/task/guide catalog from data files.
+
+    python scripts/load_catalog.py [--catalog-dir catalog] [--dry-run] [--no-delete]
+
+Data files:
+  catalog/modules/<slug>.yaml  one module, with its tasks in display order
+  catalog/guides/<slug>.md     markdown with a YAML front matter block
+                               (title, subtitle, module, is_essential, and
+                               optionally reading_time, else estimated)
+
+Rows are matched by natural key: modules by slug, tasks by (module slug,
+title), guides by slug. The script diffs the files against the tables and
+applies the inserts, updates and deletes as bulk statements in a single
+transaction, then bumps the catalog version so API workers reload. Renaming
+a task is a delete plus an insert, which drops users' progress on it.
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import yaml
+
+# libyaml's parser is ~10x faster than the pure-Python one when available
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Add parent directory to path so we can import app modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from sqlalchemy import delete, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.guide import Guide
+from app.models.module import Module
+from app.models.task import Task
+from app.utils.catalog import bump_catalog_version
+from app.utils.guides import estimate_reading_time
+
+DEFAULT_CATALOG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "catalog")
+
+MODULE_FIELDS = ("name", "description", "icon", "color", "order_index")
+TASK_FIELDS = ("description", "estimated_time", "difficulty", "order_index", "guide_slug")
+GUIDE_FIELDS = ("module_id", "title", "subtitle", "content", "reading_time", "is_essential")
+
+
+class CatalogError(Exception):
+    pass
+
+
+@dataclass
+class CatalogData:
+    modules: Dict[str, dict] = field(default_factory=dict)  # slug -> fields
+    tasks: Dict[Tuple[str, str], dict] = field(default_factory=dict)  # (module slug, title) -> fields
+    guides: Dict[str, dict] = field(default_factory=dict)  # slug -> fields (module slug under "module")
+
+
+@dataclass
+class TableDiff:
+    inserts: List[dict] = field(default_factory=list)
+    updates: List[dict] = field(default_factory=list)
+    delete_ids: List[int] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.inserts or self.updates or self.delete_ids)
+
+    def summary(self) -> str:
+        return f"+{len(self.inserts)} ~{len(self.updates)} -{len(self.delete_ids)}"
+
+
+def _split_front_matter(raw: str, path: str) -> Tuple[dict, str]:
+    if not raw.startswith("---\n"):
+        raise CatalogError(f"{path}: missing front matter")
+    end = raw.find("\n---\n", 4)
+    if end == -1:
+        raise CatalogError(f"{path}: unterminated front matter")
+    return yaml.load(raw[4:end], Loader=YamlLoader) or {}, raw[end + 5:].strip() + "\n"
+
+
+def read_catalog_files(catalog_dir: str) -> CatalogData:
+    data = CatalogData()
+
+    modules_dir = os.path.join(catalog_dir, "modules")
+    for filename in sorted(os.listdir(modules_dir)):
+        if not filename.endswith((".yaml", ".yml")):
+            continue
+        path = os.path.join(modules_dir, filename)
+        with open(path) as f:
+            module = yaml.load(f, Loader=YamlLoader)
+
+        slug = module["slug"]
+        if slug in data.modules:
+            raise CatalogError(f"{path}: duplicate module slug {slug!r}")
+        data.modules[slug] = {name: module.get(name) for name in MODULE_FIELDS}
+
+        for order_index, task in enumerate(module.get("tasks") or [], start=1):
+            key = (slug, task["title"])
+            if key in data.tasks:
+                raise CatalogError(f"{path}: duplicate task title {task['title']!r}")
+            data.tasks[key] = {
+                "description": task.get("description"),
+                "estimated_time": task.get("estimated_time"),
+                "difficulty": task.get("difficulty"),
+                "order_index": order_index,
+                "guide_slug": task.get("guide_slug"),
+            }
+
+    # Insert in display order, so a fresh database gets ids in that order too
+    order = {slug: module["order_index"] for slug, module in data.modules.items()}
+    data.modules = dict(sorted(data.modules.items(), key=lambda item: item[1]["order_index"]))
+    data.tasks = dict(sorted(data.tasks.items(), key=lambda item: (order[item[0][0]], item[1]["order_index"])))
+
+    guides_dir = os.path.join(catalog_dir, "guides")
+    if os.path.isdir(guides_dir):
+        for filename in sorted(os.listdir(guides_dir)):
+            if not filename.endswith(".md"):
+                continue
+            path = os.path.join(guides_dir, filename)
+            with open(path) as f:
+                meta, content = _split_front_matter(f.read(), path)
+            if meta.get("module") not in data.modules:
+                raise CatalogError(f"{path}: unknown module {meta.get('module')!r}")
+            data.guides[filename[:-3]] = {
+                "module": meta["module"],
+                "title": meta["title"],
+                "subtitle": meta.get("subtitle"),
+                "content": content,
+                # Computed here once rather than per request
+                "reading_time": meta.get("reading_time") or estimate_reading_time(content),
+                "is_essential": bool(meta.get("is_essential", False)),
+            }
+
+    return data
+
+
+def _diff(current: Dict, desired: Dict, fields, allow_delete: bool) -> Tuple[TableDiff, List]:
+    """Diff rows keyed by natural key. `current` maps key -> (id, {field: value}).
+
+    Returns the diff and the keys that need inserting (in `desired` order).
+    """
+    diff = TableDiff()
+    new_keys = []
+    for key, wanted in desired.items():
+        existing = current.get(key)
+        if existing is None:
+            new_keys.append(key)
+            continue
+        row_id, values = existing
+        if any(values[name] != wanted[name] for name in fields):
+            diff.updates.append({"id": row_id, **{name: wanted[name] for name in fields}})
+    if allow_delete:
+        diff.delete_ids = [row_id for key, (row_id, _) in current.items() if key not in desired]
+    return diff, new_keys
+
+
+def _apply(db: Session, model, diff: TableDiff) -> None:
+    if diff.delete_ids:
+        db.execute(delete(model).where(model.id.in_(diff.delete_ids)))
+    if diff.updates:
+        db.execute(update(model), diff.updates)  # executemany, keyed by primary key
+    if diff.inserts:
+        db.execute(insert(model), diff.inserts)
+
+
+def load_catalog(db: Session, data: CatalogData, allow_delete: bool = True, dry_run: bool = False) -> Dict[str, TableDiff]:
+    """Bring the catalog tables in line with `data`; the caller commits"""
+    # One loader at a time; readers (the API) are not blocked
+    if db.bind.dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE modules, tasks, guides IN SHARE ROW EXCLUSIVE MODE"))
+
+    # Modules first: tasks and guides need their ids
+    current_modules = {
+        row.slug: (row.id, {name: getattr(row, name) for name in MODULE_FIELDS})
+        for row in db.execute(select(Module.id, Module.slug, *(getattr(Module, n) for n in MODULE_FIELDS)))
+    }
+    module_diff, new_slugs = _diff(current_modules, data.modules, MODULE_FIELDS, allow_delete)
+    module_diff.inserts = [{"slug": slug, **data.modules[slug]} for slug in new_slugs]
+    if not dry_run:
+        _apply(db, Module, module_diff)
+    module_ids = dict(db.execute(select(Module.slug, Module.id)).all())
+
+    current_tasks = {
+        (row.slug, row.title): (row.id, {name: getattr(row, name) for name in TASK_FIELDS})
+        for row in db.execute(
+            select(Module.slug, Task.id, Task.title, *(getattr(Task, n) for n in TASK_FIELDS))
+            .join(Module, Module.id == Task.module_id)
+        )
+    }
+    task_diff, new_task_keys = _diff(current_tasks, data.tasks, TASK_FIELDS, allow_delete)
+    task_diff.inserts = [
+        {"module_id": module_ids.get(slug), "title": title, **data.tasks[(slug, title)]}
+        for slug, title in new_task_keys
+    ]
+    if not dry_run:
+        _apply(db, Task, task_diff)
+
+    desired_guides = {
+        slug: {"module_id": module_ids.get(guide["module"]), **{k: v for k, v in guide.items() if k != "module"}}
+        for slug, guide in data.guides.items()
+    }
+    current_guides = {
+        row.slug: (row.id, {name: getattr(row, name) for name in GUIDE_FIELDS})
+        for row in db.execute(select(Guide.id, Guide.slug, *(getattr(Guide, n) for n in GUIDE_FIELDS)))
+    }
+    guide_diff, new_guide_slugs = _diff(current_guides, desired_guides, GUIDE_FIELDS, allow_delete)
+    guide_diff.inserts = [{"slug": slug, **desired_guides[slug]} for slug in new_guide_slugs]
+    if not dry_run:
+        _apply(db, Guide, guide_diff)
+
+    diffs = {"modules": module_diff, "tasks": task_diff, "guides": guide_diff}
+    if not dry_run and any(diffs.values()):
+        # Tell running API workers to reload their catalog cache
+        bump_catalog_version(db)
+    return diffs
+
+
+def run(catalog_dir: str = DEFAULT_CATALOG_DIR, allow_delete: bool = True, dry_run: bool = False) -> bool:
+    """Load the catalog in one transaction; returns whether anything changed"""
+    started = time.perf_counter()
+    data = read_catalog_files(catalog_dir)
+    print(f"📂 Read {len(data.modules)} modules, {len(data.tasks)} tasks, {len(data.guides)} guides")
+
+    db = SessionLocal()
+    try:
+        diffs = load_catalog(db, data, allow_delete=allow_delete, dry_run=dry_run)
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    for table, diff in diffs.items():
+        print(f"  {table:<8} {diff.summary()}")
+    changed = any(diffs.values())
+    elapsed = (time.perf_counter() - started) * 1000
+    if dry_run:
+        print(f"🔎 Dry run, nothing written ({elapsed:.0f}ms)")
+    elif changed:
+        print(f"✅ Catalog updated in {elapsed:.0f}ms")
+    else:
+        print(f"⏭️  Catalog already up to date ({elapsed:.0f}ms)")
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalog-dir", default=DEFAULT_CATALOG_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="print the diff without writing it")
+    parser.add_argument("--no-delete", action="store_true", help="keep rows missing from the files")
+    args = parser.parse_args()
+
+    try:
+        run(args.catalog_dir, allow_delete=not args.no_delete, dry_run=args.dry_run)
+    except CatalogError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
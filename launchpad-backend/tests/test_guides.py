@@ -0,0 +1,21 @@
+import pytest
+
+from app.utils.guides import choose_encoding
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, "identity"),
+    ("", "identity"),
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("BR ; Q=0.5", "br"),
+    ("*", "br"),
+    # An explicit refusal wins over the wildcard
+    ("br;q=0, *", "gzip"),
+    ("br;q=0, gzip;q=0, *", "identity"),
+    ("*;q=0", "identity"),
+    ("*;q=0, gzip", "gzip"),
+])
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
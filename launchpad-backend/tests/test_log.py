@@ -0,0 +1,22 @@
+import logging
+
+from app.utils.log import _DeferredQueueHandler, configure_logging, shutdown_logging
+
+
+def queue_handlers():
+    return [h for h in logging.getLogger("app").handlers if isinstance(h, _DeferredQueueHandler)]
+
+
+def test_logging_can_be_configured_again_after_shutdown(capsys):
+    # As two lifespans in a row would
+    shutdown_logging()
+    assert queue_handlers() == []
+
+    for attempt in ("first", "second"):
+        configure_logging()
+        configure_logging()
+        assert len(queue_handlers()) == 1
+        logging.getLogger("app.test").warning("%s lifespan", attempt)
+        shutdown_logging()
+        assert queue_handlers() == []
+        assert f"{attempt} lifespan" in capsys.readouterr().out
@@ -0,0 +1,28 @@
+import re
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.auth import create_access_token, verify_token
+
+
+def read_counter(client, name):
+    body = client.get("/metrics").text
+    match = re.search(rf"^{name} (\S+)$", body, re.MULTILINE)
+    assert match, f"{name} missing from /metrics"
+    return float(match.group(1))
+
+
+def test_token_cache_hits_and_misses_are_exported():
+    # Not entered as a context manager: no lifespan, so no database needed
+    client = TestClient(app)
+    hits = read_counter(client, "launchpad_token_cache_hits_total")
+    misses = read_counter(client, "launchpad_token_cache_misses_total")
+
+    token = create_access_token(12345)
+    verify_token(token)  # decoded, then cached
+    verify_token(token)
+    verify_token(token)
+
+    assert read_counter(client, "launchpad_token_cache_misses_total") == misses + 1
+    assert read_counter(client, "launchpad_token_cache_hits_total") == hits + 2
@@ -1,5 +1,8 @@
 import { apiClient } from './client';
 
+// The refresh token is rotated on use, so concurrent callers share one call
+let pendingRefresh = null;
+
 export const authApi = {
   login: async (email, password) => {
     const { data } = await apiClient.post('/auth/login', {
@@ -18,8 +21,29 @@ export const authApi = {
     return data;
   },
 
+  // Swaps the stored refresh token for a new access token; rejects if the
+  // session is over
+  refresh: () => {
+    if (!pendingRefresh) {
+      const refreshToken = localStorage.getItem('refresh_token');
+      if (!refreshToken) return Promise.reject(new Error('No refresh token'));
+      pendingRefresh = apiClient
+        .post('/auth/refresh', { refresh_token: refreshToken })
+        .then(({ data }) => {
+          localStorage.setItem('token', data.access_token);
+          localStorage.setItem('refresh_token', data.refresh_token);
+          return data.access_token;
+        })
+        .finally(() => {
+          pendingRefresh = null;
+        });
+    }
+    return pendingRefresh;
+  },
+
   logout: () => {
     localStorage.removeItem('token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
   },
 };
@@ -0,0 +1,80 @@
+import { authApi } from './auth';
+import { API_BASE_URL } from './client';
+
+const RECONNECT_DELAY_MS = 3000;
+
+// Calls onChange({ type: 'progress', changes }) when a task is toggled on
+// any device, and onChange({ type: 'resync' }) when changes may have been
+// missed (after a reconnect). Returns a function that closes the stream.
+//
+// Uses fetch rather than EventSource so the token goes in the
+// Authorization header instead of the URL. The server ends the stream when
+// the token expires; the reconnect is then refused and the token refreshed.
+export function subscribeToProgress(onChange) {
+  const controller = new AbortController();
+  let connectedBefore = false;
+  let justRefreshed = false;
+
+  const handleEvent = (type, data) => {
+    if (type === 'progress') {
+      onChange({ type, changes: JSON.parse(data).changes });
+    } else if (type === 'resync') {
+      // The server opens every stream with a resync; on the first
+      // connection the page has only just loaded its data
+      if (connectedBefore) onChange({ type });
+      connectedBefore = true;
+    }
+  };
+
+  const connect = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const response = await fetch(`${API_BASE_URL}/progress/stream`, {
+          headers: { Authorization: `Bearer ${localStorage.getItem('token')}` },
+          signal: controller.signal,
+        });
+        if (response.status === 401 || response.status === 403) {
+          // Refused right after a refresh: the user is gone, stop for good
+          if (justRefreshed) return;
+          try {
+            await authApi.refresh();
+          } catch {
+            return;
+          }
+          justRefreshed = true;
+          continue;
+        }
+        if (!response.ok) throw new Error(`Progress stream failed: ${response.status}`);
+        justRefreshed = false;
+
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          // Events are separated by a blank line
+          let end;
+          while ((end = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            let type = 'message';
+            let data = '';
+            for (const line of block.split('\n')) {
+              if (line.startsWith('event: ')) type = line.slice(7);
+              else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            handleEvent(type, data);
+          }
+        }
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        console.error('Progress stream interrupted:', error);
+      }
+      await new Promise((resolve) => setTimeout(resolve, RECONNECT_DELAY_MS));
+    }
+  };
+
+  connect();
+  return () => controller.abort();
+}
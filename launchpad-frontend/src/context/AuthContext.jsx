@@ -37,6 +37,7 @@ export function AuthProvider({ children }) {
     console.log('✅ Login response:', response);
     
     localStorage.setItem('token', response.access_token);
+    localStorage.setItem('refresh_token', response.refresh_token);
     localStorage.setItem('user', JSON.stringify(response.user));
     
     console.log('✅ Token stored, setting user state');
@@ -51,6 +52,7 @@ export function AuthProvider({ children }) {
     console.log('✅ Signup response:', response);
     
     localStorage.setItem('token', response.access_token);
+    localStorage.setItem('refresh_token', response.refresh_token);
     localStorage.setItem('user', JSON.stringify(response.user));
     
     console.log('✅ Token stored, setting user state');
@@ -2,22 +2,30 @@ import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { apiClient } from '../api/client';
+import { subscribeToProgress } from '../api/progressStream';
 
 export default function DashboardPage() {
   const { user, logout } = useAuth();
+  const [dashboardUser, setDashboardUser] = useState(null);
   const [modules, setModules] = useState([]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    loadModules();
+    loadDashboard();
+    // Toggles from other devices: refetch rather than poll (a 304 when the
+    // change was already seen)
+    return subscribeToProgress(() => loadDashboard());
   }, []);
 
-  const loadModules = async () => {
+  // One request for the whole page: user, module cards, progress and
+  // recommendations come back together
+  const loadDashboard = async () => {
     try {
-      const { data } = await apiClient.get('/modules');
-      setModules(data);
+      const { data } = await apiClient.get('/dashboard');
+      setDashboardUser(data.user);
+      setModules(data.modules);
     } catch (error) {
-      console.error('Failed to load modules:', error);
+      console.error('Failed to load dashboard:', error);
     }
     setLoading(false);
   };
@@ -160,7 +168,7 @@ export default function DashboardPage() {
       <header style={styles.header}>
         <h1 style={styles.headerTitle}>Launchpad</h1>
         <div style={styles.headerRight}>
-          <span style={styles.userName}>Hey, {user?.name || 'there'}!</span>
+          <span style={styles.userName}>Hey, {dashboardUser?.name || user?.name || 'there'}!</span>
           <button
             onClick={logout}
             style={styles.logoutBtn}
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
 import { apiClient } from '../api/client';
+import { subscribeToProgress } from '../api/progressStream';
 import { useAuth } from '../context/AuthContext';
 
 export default function ModuleDetailPage() {
@@ -13,6 +14,12 @@ export default function ModuleDetailPage() {
 
   useEffect(() => {
     loadModule();
+    // Refetch when this module's tasks change on another device
+    return subscribeToProgress((event) => {
+      if (event.type === 'resync' || event.changes.some((change) => change.module === slug)) {
+        loadModule();
+      }
+    });
   }, [slug]);
 
   const loadModule = async () => {